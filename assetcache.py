@@ -0,0 +1,95 @@
+import hashlib
+import mmap
+import os
+import pygame
+from constants import ASSET_CACHE, ASSET_CACHE_DIR
+
+class AssetCache:
+    """Decoded assets kept on disk as raw bytes, so later launches can mmap them.
+
+    Entries are keyed by the source file's path, size and modification time
+    plus whatever the decoded form depends on (resolution, mixer format), so
+    a changed asset or setting simply misses. Any failure falls back to
+    decoding the source file.
+    """
+
+    def __init__(self, directory=ASSET_CACHE_DIR, enabled=ASSET_CACHE):
+        self.directory = directory
+        self.enabled = enabled
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def background(self, path, size):
+        """Load an image scaled to size and converted for the display"""
+        width, height = size
+        cache_path = self._entry(path, "rgbx", width, height)
+        if cache_path:
+            data = self._map(cache_path, width * height * 4)
+            if data is not None:
+                image = pygame.image.frombuffer(data, size, "RGBX")
+                surface = image.convert()
+                del image  # Release the buffer so the mapping can be closed
+                data.close()
+                self.hits += 1
+                return surface
+
+        surface = pygame.transform.scale(pygame.image.load(path).convert(), size)
+        self.misses += 1
+        if cache_path:
+            self._write(cache_path, pygame.image.tobytes(surface, "RGBX"))
+        return surface
+
+    def sound(self, path):
+        """Load a sound as the mixer's raw samples, decoding the file only on a miss"""
+        cache_path = self._entry(path, "pcm", *pygame.mixer.get_init())
+        if cache_path:
+            data = self._map(cache_path)
+            if data is not None:
+                sound = pygame.mixer.Sound(buffer=data)  # Copies the samples
+                data.close()
+                self.hits += 1
+                return sound
+
+        sound = pygame.mixer.Sound(path)
+        self.misses += 1
+        if cache_path:
+            self._write(cache_path, sound.get_raw())
+        return sound
+
+    def _entry(self, path, kind, *params):
+        if not self.enabled:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None  # Let the loader report the missing file
+        key = f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{params}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.directory, f"{name}-{digest}.{kind}")
+
+    def _map(self, cache_path, expected_size=None):
+        try:
+            with open(cache_path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return None
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+        if expected_size is not None and len(data) != expected_size:
+            data.close()  # Truncated entry, rebuild it
+            return None
+        return data
+
+    def _write(self, cache_path, data):
+        # Write to a temporary name first, so a crash never leaves a partial entry behind
+        temporary = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary, "wb") as file:
+                file.write(data)
+            os.replace(temporary, cache_path)
+        except OSError as e:
+            print(f"Warning: Could not write asset cache entry {cache_path}: {e}")
@@ -1,57 +1,76 @@
 from circleshape import CircleShape 
 from constants import *
 from explosion import Explosion
+from spritecache import SpriteCache
+from asteroidstore import StoredField
+from shapes import ShapeLibrary
+from lod import LOD_FULL, LOD_FLAT
+from pool import Pool, Pooled
 import pygame
-import random
+import rng
 import math
 
-class Asteroid(CircleShape):
-    containers = None
+FLAT_COLOR = tuple(int(c * ((AMBIENT_LIGHT + 1) / 2)) for c in ASTEROID_BASE_COLOR)  # Lit half way between ambient and full light
+
+class Asteroid(Pooled, CircleShape):
+    __slots__ = ('shape', 'store', 'slot', '_position', '_prev_position', '_velocity', '_rotation',
+                 '_rotation_speed', '_radius')  # Underscored fields hold the state while out of the store
     game = None  # Will hold reference to game instance for sound access
+    use_sprite_cache = ASTEROID_SPRITE_CACHE  # False falls back to rendering every frame
+    sprite_cache = SpriteCache()  # Pre-rotated frames shared by all asteroids
+    shapes = ShapeLibrary()  # Outline templates, shared by every asteroid of the same variant
+    lod = None  # LodController picking detail tiers, None draws everything at full detail
+
+    position = StoredField(vector=True)
+    prev_position = StoredField(vector=True)
+    velocity = StoredField(vector=True)
+    rotation = StoredField()
+    rotation_speed = StoredField()
+    radius = StoredField()
 
-    def __init__(self, x, y, radius):
+    def __init__(self, x, y, radius, store):
+        self.slot = -1  # Row in the store, -1 while not in it
         super().__init__(x, y, radius)
-        self.rotation = random.uniform(0, 360)
-        self.rotation_speed = random.uniform(-90, 90)  # Degrees per second
-        
-        # Generate points for lumpy shape
-        self.num_points = random.randint(ASTEROID_MIN_POINTS, ASTEROID_MAX_POINTS)
-        self.variations = []
-        for _ in range(self.num_points):
-            variation = random.uniform(ASTEROID_MIN_VARIATION, ASTEROID_MAX_VARIATION)
-            self.variations.append(variation)
-        
-        # Generate random crater positions
-        self.craters = []
-        for _ in range(ASTEROID_CRATER_COUNT):
-            angle = random.uniform(0, 360)
-            distance = random.uniform(0.2, 0.8) * radius
-            crater_radius = random.uniform(0.2, 0.4) * radius
-            self.craters.append((angle, distance, crater_radius))
-        
-        # Generate surface noise points
-        self.noise_points = []
-        noise_count = int(radius / 3)  # Scale noise points with asteroid size
-        for _ in range(noise_count):
-            angle = random.uniform(0, 360)
-            distance = random.uniform(0.8, 1.0) * radius
-            size = random.uniform(2, 4)
-            height = random.uniform(0.5, 1.0)  # Relative height for lighting
-            self.noise_points.append((angle, distance, size, height))
-
-    def get_lumpy_points(self):
-        points = []
-        normals = []  # Store normal vectors for lighting
-        for i in range(self.num_points):
-            angle = math.radians(360 / self.num_points * i + self.rotation)
-            distance = self.radius * self.variations[i]
-            x = math.cos(angle) * distance
-            y = math.sin(angle) * distance
-            points.append((x, y))
-            # Calculate normal vector for this point
-            normal = pygame.Vector2(x, y).normalize()
-            normals.append(normal)
-        return points, normals
+        self.generate_shape()
+        store.add(self)  # The AsteroidStore of the game it is spawned into
+
+    def reset(self, x, y, radius, store):
+        # Reinitialize a pooled asteroid in place with a new shape
+        self.position = (x, y)
+        self.prev_position = (x, y)
+        self.velocity = (0, 0)
+        self.radius = radius
+        self.generate_shape()
+        store.add(self)
+
+    def generate_shape(self):
+        radius = self.radius
+        self.rotation = rng.asteroid.uniform(0, 360)
+        self.rotation_speed = rng.asteroid.uniform(-90, 90)  # Degrees per second
+        self.shape = Asteroid.shapes.pick(radius, rng.asteroid)
+
+        # Bake the lit, masked frame for the starting rotation up front
+        if Asteroid.use_sprite_cache:
+            self.frame(self.rotation)
+
+    def get_lumpy_points(self, rotation=None):
+        if rotation is None:
+            rotation = self.rotation
+        return self.shape.points(rotation)
+
+    def overlaps_circle(self, center, radius):
+        """Whether a circle touches this asteroid's outline rather than just its bounding circle"""
+        position = self.position
+        return self.overlaps_offset(center[0] - position.x, center[1] - position.y, radius)
+
+    def overlaps_offset(self, dx, dy, radius):
+        """Like overlaps_circle, for a circle centred (dx, dy) away from this asteroid's centre"""
+        local = pygame.Vector2(dx, dy).rotate(-self.drawn_rotation())
+        return self.shape.overlaps_circle(local.x, local.y, radius)
+
+    def drawn_rotation(self):
+        """The rotation snapped to the sprite cache's buckets: drawn at in every mode, and hit-tested at"""
+        return Asteroid.sprite_cache.angle(self.rotation)
 
     def get_lighting_factor(self, normal, height_modifier=0):
         # Normalize light direction
@@ -69,16 +88,50 @@ class Asteroid(CircleShape):
         lit_color = [int(c * lighting_factor) for c in color[:3]]
         return (*lit_color, color[3] if len(color) > 3 else 255)
 
+    def frame(self, rotation):
+        """Cached full-detail frame. A cached frame blits at the same cost whatever its detail, so
+        only full detail is kept, and detail changes never cause a burst of re-renders"""
+        return Asteroid.sprite_cache.get(self.shape.key, rotation, self.render)
+
     def draw(self, screen):
+        # Skip asteroids off screen before fetching or rendering a frame for them
+        position = self.screen_position()
+        if not self.on_screen(position, self.radius * 1.4):
+            return None
+
+        tier = Asteroid.lod.tier(self.radius) if Asteroid.lod else LOD_FULL
+        if tier >= LOD_FLAT:
+            return self.draw_flat(screen, position, tier)
+        if Asteroid.use_sprite_cache:
+            surface = self.frame(self.rotation)
+        else:
+            surface = self.render(self.drawn_rotation(), tier)
+
+        # Blit the asteroid surface onto the screen
+        surface_size = surface.get_width()
+        screen_pos = (int(position.x - surface_size//2),
+                     int(position.y - surface_size//2))
+        return screen.blit(surface, screen_pos)
+
+    def draw_flat(self, screen, position, tier):
+        """Draw the flat or outline tier straight onto the screen, which is cheaper than blitting a frame"""
+        points = self.shape.outline(self.drawn_rotation(), position.x, position.y)
+        if tier == LOD_FLAT:
+            pygame.draw.polygon(screen, FLAT_COLOR, points)
+        return pygame.draw.polygon(screen, (255, 255, 255), points, 1)
+
+    def render(self, rotation, tier=LOD_FULL):
+        """Render the asteroid at the given rotation onto a new surface, at full or no-noise detail (see lod.py)"""
         # Create a surface for the asteroid with alpha channel
+        shape = self.shape
         surface_size = int(self.radius * 2.8)  # Larger to accommodate lumpy shape
         surface = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
         center = (surface_size // 2, surface_size // 2)
         
         # Get lumpy shape points and normals
-        shape_points, shape_normals = self.get_lumpy_points()
+        shape_points, shape_normals = self.get_lumpy_points(rotation)
         screen_points = [(int(x + center[0]), int(y + center[1])) for x, y in shape_points]
-        
+
         # Create base polygon surface
         base_surface = pygame.Surface((surface_size, surface_size), pygame.SRCALPHA)
         
@@ -93,9 +146,9 @@ class Asteroid(CircleShape):
             pygame.draw.polygon(base_surface, color, triangle)
         
         # Draw craters with lighting
-        for angle, distance, crater_radius in self.craters:
+        for angle, distance, crater_radius in shape.craters:
             # Rotate crater position
-            rotated_angle = math.radians(angle + self.rotation)
+            rotated_angle = math.radians(angle + rotation)
             crater_x = center[0] + math.cos(rotated_angle) * distance
             crater_y = center[1] + math.sin(rotated_angle) * distance
             
@@ -110,9 +163,9 @@ class Asteroid(CircleShape):
                             int(crater_radius))
         
         # Draw surface bumps with lighting
-        for angle, distance, size, height in self.noise_points:
+        for angle, distance, size, height in (shape.noise_points if tier == LOD_FULL else ()):
             # Rotate bump position
-            rotated_angle = math.radians(angle + self.rotation)
+            rotated_angle = math.radians(angle + rotation)
             bump_x = center[0] + math.cos(rotated_angle) * distance
             bump_y = center[1] + math.sin(rotated_angle) * distance
             
@@ -136,29 +189,13 @@ class Asteroid(CircleShape):
         
         # Draw outline
         pygame.draw.polygon(surface, (255, 255, 255), screen_points, 1)
-        
-        # Blit the asteroid surface onto the screen
-        screen_pos = (int(self.position.x - surface_size//2),
-                     int(self.position.y - surface_size//2))
-        screen.blit(surface, screen_pos)
-
-    def update(self, dt):
-        # Update position
-        self.position += self.velocity * dt
-        self.wrap_position()
-        # Update rotation
-        self.rotation += self.rotation_speed * dt
-
-    def wrap_position(self):
-        """Wrap the asteroid's position around screen edges"""
-        if self.position.x < 0:
-            self.position.x = SCREEN_WIDTH
-        elif self.position.x > SCREEN_WIDTH:
-            self.position.x = 0
-        if self.position.y < 0:
-            self.position.y = SCREEN_HEIGHT
-        elif self.position.y > SCREEN_HEIGHT:
-            self.position.y = 0
+        return surface
+
+    def kill(self):
+        # Leave the store first, so the asteroid keeps its last state while pooled
+        if self.slot >= 0:
+            self.store.remove(self)
+        super().kill()
 
     def split(self):
         # Play explosion sound based on asteroid size
@@ -172,12 +209,10 @@ class Asteroid(CircleShape):
                 sound_name = 'small_explosion'
                 
             if sound_name:
-                sound = Asteroid.game.get_sound(sound_name)
-                if sound:
-                    sound.play()
+                Asteroid.game.play_sound(sound_name)
         
         # Create explosion effect
-        Explosion(self.position.x, self.position.y, color=(255, 200, 100))
+        self.registry.add(Explosion.spawn(self.position.x, self.position.y, color=(255, 200, 100)))
         
         # If the asteroid is too small, just remove it
         if self.radius <= ASTEROID_MIN_RADIUS:
@@ -188,22 +223,18 @@ class Asteroid(CircleShape):
         new_radius = self.radius - ASTEROID_MIN_RADIUS
         
         # Generate random angles for the new velocities
-        split_angle = random.uniform(20, 50)
+        split_angle = rng.asteroid.uniform(20, 50)
         velocity1 = self.velocity.rotate(split_angle) * 1.2
         velocity2 = self.velocity.rotate(-split_angle) * 1.2
         
-        # Create the new asteroids
-        asteroid1 = Asteroid(self.position.x, self.position.y, new_radius)
+        # Create the new asteroids in this one's store and registry
+        asteroid1 = self.registry.add(Asteroid.spawn(self.position.x, self.position.y, new_radius, self.store))
         asteroid1.velocity = velocity1
         
-        asteroid2 = Asteroid(self.position.x, self.position.y, new_radius)
+        asteroid2 = self.registry.add(Asteroid.spawn(self.position.x, self.position.y, new_radius, self.store))
         asteroid2.velocity = velocity2
         
-        # Add them to the sprite groups
-        if self.containers:
-            for group in self.containers:
-                group.add(asteroid1)
-                group.add(asteroid2)
-        
         # Remove the original asteroid
-        self.kill()
\ No newline at end of file
+        self.kill()
+
+Asteroid.pool = Pool(Asteroid)
\ No newline at end of file
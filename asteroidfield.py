@@ -1,49 +1,102 @@
 import pygame
-import random
+import rng
 from asteroid import Asteroid
+from entity import Entity
 from constants import *
 
 
-class AsteroidField(pygame.sprite.Sprite):
-    containers = None
+class AsteroidField(Entity):
+    """Spawns asteroids at the world's edges, keeping the population within bounds.
+
+    Above the throttle mass spawns slow down; at the maximum mass, or
+    while recent frames have run over the frame budget, a due spawn is
+    deferred and tried again a little later. Every decision is counted.
+    The frame time is fed in by the live game (frame_ms) and stays 0 in
+    headless runs and while recording, so those stay deterministic.
+    """
     edges = [
         [
             pygame.Vector2(1, 0),  # Spawns on right edge, moves right
-            lambda y: pygame.Vector2(SCREEN_WIDTH + ASTEROID_MAX_RADIUS, y * SCREEN_HEIGHT),
+            lambda world, y: pygame.Vector2(world.width + ASTEROID_MAX_RADIUS, y * world.height),
         ],
         [
             pygame.Vector2(-1, 0),  # Spawns on left edge, moves left
-            lambda y: pygame.Vector2(-ASTEROID_MAX_RADIUS, y * SCREEN_HEIGHT),
+            lambda world, y: pygame.Vector2(-ASTEROID_MAX_RADIUS, y * world.height),
         ],
         [
             pygame.Vector2(0, 1),  # Spawns on bottom edge, moves down
-            lambda x: pygame.Vector2(x * SCREEN_WIDTH, SCREEN_HEIGHT + ASTEROID_MAX_RADIUS),
+            lambda world, x: pygame.Vector2(x * world.width, world.height + ASTEROID_MAX_RADIUS),
         ],
         [
             pygame.Vector2(0, -1),  # Spawns on top edge, moves up
-            lambda x: pygame.Vector2(x * SCREEN_WIDTH, -ASTEROID_MAX_RADIUS),
+            lambda world, x: pygame.Vector2(x * world.width, -ASTEROID_MAX_RADIUS),
         ],
     ]
 
-    def __init__(self):
-        pygame.sprite.Sprite.__init__(self, self.containers)
+    def __init__(self, world, store, max_mass=ASTEROID_MAX_MASS, throttle_mass=ASTEROID_THROTTLE_MASS,
+                 throttle=ASTEROID_SPAWN_THROTTLE, frame_budget_ms=ASTEROID_SPAWN_FRAME_MS, retry=ASTEROID_SPAWN_RETRY):
+        super().__init__()
+        self.world = world  # Asteroids spawn just outside its edges
+        self.store = store  # AsteroidStore of the game's asteroids, weighed for the population caps
         self.spawn_timer = 0.0
+        self.max_mass = max_mass
+        self.throttle_mass = throttle_mass
+        self.throttle = throttle
+        self.frame_budget_ms = frame_budget_ms
+        self.retry = retry
+        self.frame_ms = 0.0  # Smoothed frame work time, set by the game loop
+
+        # Statistics
+        self.spawned = 0
+        self.throttled = 0  # Spawns that waited for the throttled interval
+        self.deferred_mass = 0
+        self.deferred_frame = 0
+
+    def mass(self):
+        """Total radius kinds of every live asteroid"""
+        store = self.store
+        return round(float(store.radius[:store.count].sum()) / ASTEROID_MIN_RADIUS)
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        asteroid = self.registry.add(Asteroid.spawn(position.x, position.y, radius, self.store))
         asteroid.velocity = velocity
 
     def update(self, dt):
         self.spawn_timer += dt
         if self.spawn_timer > ASTEROID_SPAWN_RATE:
+            mass = self.mass()
+            throttled = mass > self.throttle_mass
+            interval = ASTEROID_SPAWN_RATE * self.throttle if throttled else ASTEROID_SPAWN_RATE
+            if self.spawn_timer <= interval:
+                return
+            if mass >= self.max_mass:
+                self.deferred_mass += 1
+                self.spawn_timer = interval - self.retry
+                return
+            if self.frame_budget_ms and self.frame_ms > self.frame_budget_ms:
+                self.deferred_frame += 1
+                self.spawn_timer = interval - self.retry
+                return
             self.spawn_timer = 0
+            self.spawned += 1
+            if throttled:
+                self.throttled += 1
 
             # spawn a new asteroid at a random edge
-            edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            edge = rng.field.choice(self.edges)
+            speed = rng.field.randint(40, 100)
             velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))  # Add some randomness to direction
-            position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
+            velocity = velocity.rotate(rng.field.randint(-30, 30))  # Add some randomness to direction
+            position = edge[1](self.world, rng.field.uniform(0, 1))
+            kind = rng.field.randint(1, ASTEROID_KINDS)
             radius = ASTEROID_MIN_RADIUS * kind
-            self.spawn(radius, position, velocity)
\ No newline at end of file
+            self.spawn(radius, position, velocity)
+
+    def stats(self):
+        return {
+            'mass': self.mass(),
+            'spawned': self.spawned,
+            'throttled': self.throttled,
+            'deferred_mass': self.deferred_mass,
+            'deferred_frame': self.deferred_frame,
+        }
@@ -0,0 +1,110 @@
+import numpy as np
+import pygame
+
+class AsteroidStore:
+    """Struct-of-arrays kinematics for every live asteroid, advanced in one batched step.
+
+    Live asteroids occupy the first `count` slots and each one remembers its
+    store and slot. Removal moves the last asteroid into the freed slot, and the arrays
+    only grow (by doubling) when an add does not fit. A removed asteroid gets
+    its row copied back as plain attributes, so it stays readable after kill().
+    """
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.position = np.zeros((capacity, 2))
+        self.prev_position = np.zeros((capacity, 2))  # Position before the last update, for drawing between steps
+        self.velocity = np.zeros((capacity, 2))
+        self.rotation = np.zeros(capacity)
+        self.rotation_speed = np.zeros(capacity)  # Degrees per second
+        self.radius = np.zeros(capacity)
+        self.owners = []  # Asteroid in each live slot
+
+    def __len__(self):
+        return self.count
+
+    def add(self, asteroid):
+        """Move an asteroid's detached state into a new slot"""
+        slot = self.count
+        if slot == len(self.radius):
+            self._grow(slot + 1)
+        self.position[slot] = asteroid._position
+        self.prev_position[slot] = asteroid._prev_position
+        self.velocity[slot] = asteroid._velocity
+        self.rotation[slot] = asteroid._rotation
+        self.rotation_speed[slot] = asteroid._rotation_speed
+        self.radius[slot] = asteroid._radius
+        self.owners.append(asteroid)
+        asteroid.store = self
+        asteroid.slot = slot
+        self.count += 1
+
+    def remove(self, asteroid):
+        """Copy an asteroid's row back onto it and release its slot"""
+        slot = asteroid.slot
+        asteroid._position = pygame.Vector2(self.position[slot, 0], self.position[slot, 1])
+        asteroid._prev_position = pygame.Vector2(self.prev_position[slot, 0], self.prev_position[slot, 1])
+        asteroid._velocity = pygame.Vector2(self.velocity[slot, 0], self.velocity[slot, 1])
+        asteroid._rotation = float(self.rotation[slot])
+        asteroid._rotation_speed = float(self.rotation_speed[slot])
+        asteroid._radius = float(self.radius[slot])
+        asteroid.slot = -1
+
+        # Move the last asteroid into the freed slot instead of shifting the arrays
+        last = self.count - 1
+        moved = self.owners.pop()
+        if moved is not asteroid:
+            for array in (self.position, self.prev_position, self.velocity, self.rotation, self.rotation_speed, self.radius):
+                array[slot] = array[last]
+            self.owners[slot] = moved
+            moved.slot = slot
+        self.count = last
+
+    def update(self, dt, world):
+        n = self.count
+        if n == 0:
+            return
+        position = self.position[:n]
+        self.prev_position[:n] = position
+        position += self.velocity[:n] * dt
+        self.rotation[:n] += self.rotation_speed[:n] * dt
+
+        world.wrap_array(position)
+
+    def _grow(self, needed):
+        capacity = max(needed, len(self.radius) * 2)
+        for name in ('position', 'prev_position', 'velocity', 'rotation', 'rotation_speed', 'radius'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+class StoredField:
+    """Asteroid attribute that lives in the owner's store while it holds a slot.
+
+    Vector fields are returned as a fresh Vector2, so they must be written
+    back by assignment rather than mutated in place. Without a slot the value
+    is kept in a plain underscore attribute on the asteroid.
+    """
+
+    def __init__(self, vector=False):
+        self.vector = vector
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.detached = '_' + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj.slot < 0:
+            return getattr(obj, self.detached)
+        array = getattr(obj.store, self.name)
+        slot = obj.slot
+        return pygame.Vector2(array[slot, 0], array[slot, 1]) if self.vector else array.item(slot)
+
+    def __set__(self, obj, value):
+        if obj.slot < 0:
+            setattr(obj, self.detached, pygame.Vector2(value) if self.vector else value)
+        else:
+            getattr(obj.store, self.name)[obj.slot] = value
@@ -0,0 +1,104 @@
+import pygame
+from constants import SOUND_CHANNELS, SOUND_COALESCE_WINDOW, SOUND_VOICES, SOUND_CATEGORY_VOICES
+
+class Voice:
+    """What is playing on one mixer channel"""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.name = None
+        self.category = None
+        self.priority = 0
+        self.started = 0.0
+
+    def busy(self):
+        return self.name is not None and self.channel.get_busy()
+
+class VoiceManager:
+    """Plays game sounds on its own mixer channels with throttling and voice stealing.
+
+    - The same sound started again within the coalesce window is dropped,
+      since the copies would only stack into one louder sound.
+    - Each category (attacks, explosions, ...) has a voice cap, and when
+      every channel is busy the mixer as a whole is at its cap. A sound over
+      a cap steals the lowest-priority (then oldest) voice within it that
+      has no higher priority than the new sound, or is dropped.
+    Time only advances through update(), once per frame.
+    """
+
+    def __init__(self, sounds, channels=SOUND_CHANNELS, first_channel=0,
+                 voices=SOUND_VOICES, category_voices=SOUND_CATEGORY_VOICES,
+                 coalesce_window=SOUND_COALESCE_WINDOW):
+        self.sounds = sounds
+        self.voices_by_sound = voices  # Sound name -> (category, priority)
+        self.category_voices = category_voices  # Category -> voice cap
+        self.coalesce_window = coalesce_window
+        if pygame.mixer.get_num_channels() < first_channel + channels:
+            pygame.mixer.set_num_channels(first_channel + channels)
+        self.voices = [Voice(pygame.mixer.Channel(first_channel + i)) for i in range(channels)]
+        self.time = 0.0
+        self.last_started = {}  # Sound name -> time it last started
+
+        # Statistics, per sound name
+        self.counts = {}
+
+    def update(self, dt):
+        self.time += dt
+
+    def play(self, name):
+        """Start a sound by name; returns the Channel it plays on, or None if it was coalesced or dropped"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return None
+
+        last = self.last_started.get(name)
+        if last is not None and self.time - last < self.coalesce_window:
+            self._count(name, 'coalesced')
+            return None
+
+        category, priority = self.voices_by_sound.get(name, (name, 0))
+        busy = [voice for voice in self.voices if voice.busy()]
+        same_category = [voice for voice in busy if voice.category == category]
+        if len(same_category) >= self.category_voices.get(category, len(self.voices)):
+            voice = self._steal(same_category, priority)
+        else:
+            voice = next((voice for voice in self.voices if not voice.busy()), None)
+            if voice is None:
+                voice = self._steal(busy, priority)
+        if voice is None:
+            self._count(name, 'dropped')
+            return None
+
+        voice.channel.play(sound)
+        voice.name = name
+        voice.category = category
+        voice.priority = priority
+        voice.started = self.time
+        self.last_started[name] = self.time
+        self._count(name, 'played')
+        return voice.channel
+
+    def _steal(self, voices, priority):
+        """Take the lowest-priority, then oldest, of the voices no more important than priority; None if there is none"""
+        candidates = [voice for voice in voices if voice.priority <= priority]
+        if not candidates:
+            return None
+        voice = min(candidates, key=lambda v: (v.priority, v.started))
+        self._count(voice.name, 'stolen')
+        return voice
+
+    def _count(self, name, event):
+        counts = self.counts.get(name)
+        if counts is None:
+            counts = self.counts[name] = {'played': 0, 'coalesced': 0, 'dropped': 0, 'stolen': 0}
+        counts[event] += 1
+
+    def stats(self):
+        """Totals of played, coalesced, dropped and stolen sounds, plus the per-sound counts"""
+        totals = {'played': 0, 'coalesced': 0, 'dropped': 0, 'stolen': 0}
+        for counts in self.counts.values():
+            for event, count in counts.items():
+                totals[event] += count
+        totals['active'] = sum(1 for voice in self.voices if voice.busy())
+        totals['by_sound'] = {name: dict(counts) for name, counts in self.counts.items()}
+        return totals
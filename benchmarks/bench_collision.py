@@ -0,0 +1,97 @@
+"""Find the pair counts where the NumPy collision kernel beats the scalar passes.
+
+Run from the repository root: python3 benchmarks/bench_collision.py [--repeat N] [--rounds N]
+
+Each time is the best of --rounds rounds, and a crossover is only reported
+once the faster pass keeps winning at every larger size, so one noisy
+size can't move it.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Headless constants, so importing the game modules needs no display
+os.environ.setdefault("ASTEROIDS_HEADLESS", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from constants import *
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from asteroid import Asteroid
+from asteroidstore import AsteroidStore
+from circleshape import CircleShape
+from collision import CollisionSystem
+
+SIZES = [(4, 8), (10, 20), (20, 40), (40, 60), (60, 100), (100, 150), (120, 200), (150, 240), (150, 300),
+         (200, 300), (200, 400), (300, 500)]
+
+def build(shot_count, asteroid_count, rand):
+    Asteroid.use_sprite_cache = False
+    store = AsteroidStore()
+    asteroids = [Asteroid(rand.uniform(0, SCREEN_WIDTH), rand.uniform(0, SCREEN_HEIGHT),
+                          ASTEROID_MIN_RADIUS * rand.randint(1, ASTEROID_KINDS), store)
+                 for _ in range(asteroid_count)]
+    shots = [CircleShape(rand.uniform(0, SCREEN_WIDTH), rand.uniform(0, SCREEN_HEIGHT), SHOT_RADIUS)
+             for _ in range(shot_count)]
+    return shots, asteroids
+
+def timed(function, repeat, rounds):
+    """Best microseconds per call over the rounds, and the last result"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = function()
+        best = min(best, (time.perf_counter() - start) / repeat * 1e6)
+    return best, result
+
+def crossover(pairs, wins, run=2):
+    """Smallest pair count from which wins holds at every larger size (at least run of them), else None"""
+    first = None
+    for count, win in zip(pairs, wins):
+        if not win:
+            first = None
+        elif first is None:
+            first = count
+    if first is None or pairs.index(first) > len(pairs) - run:
+        return None
+    return first
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    scalar = CollisionSystem(kernel_max_pairs=None)
+    brute_force = CollisionSystem(kernel_max_pairs=None, broadphase=False)
+    kernel = CollisionSystem(kernel_max_pairs=float('inf'))
+    rand = random.Random(1)
+    pairs = []
+    beats_brute_force = []  # Per size: whether the kernel is faster than testing every pair in Python
+    loses_to_hash = []  # Per size: whether the spatial hash is faster than the kernel
+
+    print(f"{'shots':>6}{'asteroids':>10}{'pairs':>8}{'brute us':>10}{'hash us':>10}{'kernel us':>11}{'hits':>6}")
+    for shot_count, asteroid_count in SIZES:
+        shots, asteroids = build(shot_count, asteroid_count, rand)
+        brute_time, expected = timed(lambda: brute_force.shot_hits(shots, asteroids), max(1, args.repeat // 10),
+                                     args.rounds)
+        hash_time, hash_hits = timed(lambda: scalar.shot_hits(shots, asteroids), args.repeat, args.rounds)
+        kernel_time, hits = timed(lambda: kernel.shot_hits(shots, asteroids), args.repeat, args.rounds)
+        if hits != expected or hash_hits != expected:
+            print("Warning: kernel, spatial hash and brute force disagree")
+        pairs.append(shot_count * asteroid_count)
+        beats_brute_force.append(kernel_time < brute_time)
+        loses_to_hash.append(hash_time < kernel_time)
+        print(f"{shot_count:>6}{asteroid_count:>10}{pairs[-1]:>8}{brute_time:>10.1f}{hash_time:>10.1f}"
+              f"{kernel_time:>11.1f}{len(hits):>6}")
+        for asteroid in asteroids:
+            asteroid.kill()
+
+    print(f"Kernel beats brute force from {crossover(pairs, beats_brute_force)} pairs, "
+          f"spatial hash wins from {crossover(pairs, loses_to_hash)} pairs "
+          f"(COLLISION_KERNEL_MAX_PAIRS = {COLLISION_KERNEL_MAX_PAIRS})")
+
+if __name__ == "__main__":
+    main()
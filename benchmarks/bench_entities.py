@@ -0,0 +1,112 @@
+"""Compare registry-backed CircleShapes with the Sprite-based ones they replaced, at 10k entities.
+
+Run from the repository root: python3 benchmarks/bench_entities.py [--count N]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+# Headless constants, so importing the game modules needs no display
+os.environ.setdefault("ASTEROIDS_HEADLESS", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pygame
+import random
+from circleshape import CircleShape
+from entity import EntityRegistry, RegistryGroup
+from world import WorldBounds
+
+CircleShape.world = WorldBounds(1920, 1080)
+
+class SpriteShape(pygame.sprite.Sprite):
+    """CircleShape as it was before the entity registry: a Sprite joining its containers"""
+    containers = None
+
+    def __init__(self, x, y, radius):
+        super().__init__(self.containers)
+        self.position = pygame.Vector2(x, y)
+        self.prev_position = pygame.Vector2(x, y)
+        self.velocity = pygame.Vector2(0, 0)
+        self.radius = radius
+
+    def update(self, dt):
+        self.position += self.velocity * dt
+        CircleShape.world.wrap(self.position)
+
+class MovingShape(CircleShape):
+    __slots__ = ()
+
+    def update(self, dt):
+        self.position += self.velocity * dt
+        self.wrap_position()
+
+def build_sprites(count, rand):
+    # Same four-group layout the game uses for asteroids and shots
+    updatable, drawable, asteroids, shots = (pygame.sprite.Group() for _ in range(4))
+    SpriteShape.containers = (updatable, drawable, asteroids, shots)
+    for _ in range(count):
+        shape = SpriteShape(rand.uniform(0, 1920), rand.uniform(0, 1080), 20)
+        shape.velocity = pygame.Vector2(rand.uniform(-100, 100), rand.uniform(-100, 100))
+    return updatable
+
+def build_entities(count, rand):
+    registry = EntityRegistry()
+    for _ in range(count):
+        shape = registry.add(MovingShape(rand.uniform(0, 1920), rand.uniform(0, 1080), 20))
+        shape.velocity = pygame.Vector2(rand.uniform(-100, 100), rand.uniform(-100, 100))
+    return registry
+
+def measure(name, build, update, churn, count, frames):
+    tracemalloc.start()
+    container = build(count, random.Random(1))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        update(container, 1 / 60)
+    update_time = (time.perf_counter() - start) / frames
+
+    start = time.perf_counter()
+    churn(container, random.Random(2))
+    churn_time = time.perf_counter() - start
+
+    print(f"{name:<10}{memory / count:>12.0f}{update_time * 1000:>14.2f}{churn_time * 1000:>14.2f}")
+
+def sprite_update(group, dt):
+    for obj in group:
+        obj.update(dt)
+
+def sprite_churn(group, rand):
+    # Kill a tenth of the population and respawn it
+    victims = group.sprites()[::10]
+    for victim in victims:
+        victim.kill()
+    for _ in victims:
+        SpriteShape(rand.uniform(0, 1920), rand.uniform(0, 1080), 20)
+
+def entity_churn(registry, rand):
+    victims = registry.of_type(MovingShape)[::10]
+    for victim in victims:
+        victim.kill()
+    for _ in victims:
+        registry.add(MovingShape(rand.uniform(0, 1920), rand.uniform(0, 1080), 20))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{args.count} entities, {args.frames} frames")
+    print(f"{'core':<10}{'bytes/entity':>12}{'ms/update':>14}{'ms/churn':>14}")
+    measure("sprite", build_sprites, sprite_update, sprite_churn, args.count, args.frames)
+    measure("registry", build_entities, lambda registry, dt: registry.update(dt), entity_churn, args.count, args.frames)
+    # Through a group view, the way Game iterates its updatable group
+    measure("view", build_entities, lambda registry, dt: sprite_update(RegistryGroup(registry, MovingShape), dt),
+            entity_churn, args.count, args.frames)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Time canned stress scenes and compare them against stored baselines.
+
+Run from the repository root:
+    python3 benchmarks/bench_scenarios.py                 # compare with benchmarks/baselines.json
+    python3 benchmarks/bench_scenarios.py --save          # re-record the baselines on this machine
+    python3 benchmarks/bench_scenarios.py split_storm --tolerance 0.5
+
+Each scenario is seeded and built from the real game classes, and every
+frame is split into update, collision and draw time. Drawing goes to an
+offscreen surface. The exit status is 1 when any phase of any scenario
+is slower than its baseline by more than the tolerance.
+
+Baselines only mean something on the machine that recorded them, so they
+are not kept in the repository: a scenario without one has its first run
+saved as its baseline.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+# Each scenario runs in its own process (see main), so the game's class-level state starts clean
+os.environ.setdefault("ASTEROIDS_HEADLESS", "1")
+os.environ.setdefault("ASTEROIDS_RESOLUTION", "1920x1080")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+PHASES = ('update', 'collision', 'draw')
+MIN_REGRESSION_MS = 0.02  # Ignore differences smaller than this, they are timer noise
+
+def press(*names):
+    """Input mask with the named controls held by both players"""
+    import inputs
+    mask = 0
+    for name in names:
+        mask |= 1 << inputs.CONTROL_NAMES.index(name)
+    return inputs.combine(mask, mask)
+
+def scatter_asteroids(game, rand, count, kinds=None, center=None, ring=None):
+    """Spawn asteroids of every radius kind (or the given kinds) across the screen, or in a ring around center"""
+    import pygame
+    from constants import ASTEROID_MIN_RADIUS, ASTEROID_KINDS
+    from asteroid import Asteroid
+    for i in range(count):
+        kind = kinds[i % len(kinds)] if kinds else i % ASTEROID_KINDS + 1
+        if center is None:
+            x, y = rand.uniform(0, game.world.width), rand.uniform(0, game.world.height)
+        else:
+            offset = pygame.Vector2(rand.uniform(*ring), 0).rotate(360 / count * i)
+            x, y = center.x + offset.x, center.y + offset.y
+        asteroid = game.entities.add(Asteroid.spawn(x, y, ASTEROID_MIN_RADIUS * kind, game.asteroid_store))
+        asteroid.velocity = pygame.Vector2(rand.uniform(40, 100), 0).rotate(rand.uniform(0, 360))
+
+# Scenarios: setup(game, rand) once, then before_frame(game, rand, frame) -> input mask for that step
+
+def dense_field_setup(game, rand):
+    scatter_asteroids(game, rand, 300)
+
+def dense_field_frame(game, rand, frame):
+    return 0
+
+def double_super_setup(game, rand):
+    scatter_asteroids(game, rand, 60)
+
+def double_super_frame(game, rand, frame):
+    # Both players fire a super attack together every half second
+    if frame % 30 == 0:
+        game.player1.super_timer = game.player2.super_timer = 0
+        return press('super')
+    return 0
+
+def exhaust_thrust_setup(game, rand):
+    pass
+
+def exhaust_thrust_frame(game, rand, frame):
+    # Full thrust while circling, so both exhaust trails stay at their longest
+    return press('forward', 'left')
+
+def split_storm_setup(game, rand):
+    pass
+
+def split_storm_frame(game, rand, frame):
+    # Ring both ships with big asteroids and fire both supers into them, so the splits cascade
+    if frame % 90 == 0:
+        for player in (game.player1, game.player2):
+            scatter_asteroids(game, rand, 16, kinds=(3,), center=player.position, ring=(120, 220))
+            player.super_timer = 0
+            player.is_stunned = False
+        return press('super')
+    return 0
+
+SCENARIOS = {
+    'dense_field': (dense_field_setup, dense_field_frame),
+    'double_super': (double_super_setup, double_super_frame),
+    'exhaust_thrust': (exhaust_thrust_setup, exhaust_thrust_frame),
+    'split_storm': (split_storm_setup, split_storm_frame),
+}
+
+def run_scenario(name, frames, seed=1):
+    """Run one scenario in this process and return per-phase milliseconds plus entity high-water marks"""
+    import pygame
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT, SIMULATION_DT
+    from main import Game
+    from asteroid import Asteroid
+    from profiler import FrameProfiler
+
+    setup, before_frame = SCENARIOS[name]
+    game = Game(headless=True, seed=seed)
+    game.profiler = FrameProfiler(window=frames)
+    # Draw like the real game: cached asteroid frames onto an offscreen surface over a background
+    Asteroid.use_sprite_cache = True
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    background.fill((5, 5, 20))
+
+    rand = random.Random(seed)
+    setup(game, rand)
+    high_water = {}
+    for frame in range(frames):
+        input_mask = before_frame(game, rand, frame)
+        game.profiler.begin_frame()
+        game.step(SIMULATION_DT, input_mask)
+        screen.blit(background, (0, 0))
+        game.draw_world(screen)
+        game.profiler.lap('draw')
+        counts = game.entity_counts()
+        game.profiler.end_frame(counts)
+        for key, count in counts.items():
+            high_water[key] = max(high_water.get(key, 0), count)
+
+    stats = game.profiler.stats()
+    zero = {'mean': 0.0, 'p95': 0.0}
+    collision = [stats.get(phase, zero) for phase in ('player_collisions', 'shot_collisions')]
+    return {
+        'update': {'mean': stats['update']['mean'], 'p95': stats['update']['p95']},
+        'collision': {'mean': sum(s['mean'] for s in collision), 'p95': sum(s['p95'] for s in collision)},
+        'draw': {'mean': stats['draw']['mean'], 'p95': stats['draw']['p95']},
+        'high_water': high_water,
+    }
+
+def compare(name, result, baseline, tolerance):
+    """Return the list of phases of one scenario that regressed past the tolerance"""
+    regressions = []
+    for phase in PHASES:
+        now, before = result[phase]['mean'], baseline[phase]['mean']
+        if now > before * (1 + tolerance) and now - before > MIN_REGRESSION_MS:
+            # A phase that took no time before has no meaningful percentage
+            change = f"+{(now / before - 1) * 100:.0f}%" if before > 0 else f"+{now - before:.3f} ms"
+            regressions.append(f"{name}.{phase}: {before:.3f} -> {now:.3f} ms ({change})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run: {', '.join(SCENARIOS)} (default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="frames per scenario")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--baselines", default=BASELINES_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="store these results as the new baselines")
+    args = parser.parse_args()
+
+    import multiprocessing
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+    # One fresh process per scenario, run one after another so they don't compete for the CPU
+    pool = multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1)
+    try:
+        results = dict(zip(names, pool.starmap(run_scenario, [(name, args.frames) for name in names], chunksize=1)))
+    finally:
+        pool.close()
+        pool.join()
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+
+    print(f"{'scenario':<16}" + "".join(f"{phase + ' ms':>14}{'baseline':>10}" for phase in PHASES))
+    regressions = []
+    new = [name for name in results if name not in baselines]
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        row = f"{name:<16}"
+        for phase in PHASES:
+            before = f"{baseline[phase]['mean']:.3f}" if baseline else "-"
+            row += f"{result[phase]['mean']:>14.3f}{before:>10}"
+        print(row)
+        if baseline and not args.save:
+            regressions += compare(name, result, baseline, args.tolerance)
+
+    saved = list(results) if args.save else new
+    if saved:
+        baselines.update((name, results[name]) for name in saved)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved baselines for {', '.join(saved)} to {args.baselines}")
+    if args.save:
+        return 0
+    if regressions:
+        print(f"Regressions beyond {args.tolerance * 100:.0f}%:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,48 @@
 import pygame
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from entity import Entity
 
 # Base class for game objects
-class CircleShape(pygame.sprite.Sprite):
+class CircleShape(Entity):
+    __slots__ = ('position', 'prev_position', 'velocity', 'radius')
+    world = None  # WorldBounds every shape wraps and despawns by, set by the game
+    camera = None  # Camera drawing is relative to, set by the game; None draws in world coordinates
+    render_alpha = 1.0  # How far drawing is between prev_position and position, set by the game loop
+
     def __init__(self, x, y, radius):
-        # we will be using this later
-        if hasattr(self, "containers"):
-            super().__init__(self.containers)
-        else:
-            super().__init__()
+        super().__init__()
 
         self.position = pygame.Vector2(x, y)
+        self.prev_position = pygame.Vector2(x, y)  # Position before the last simulation step
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
 
-    def draw(self, screen):
-        # sub-classes must override
-        pass
+    def render_position(self):
+        """Where to draw this shape: interpolated from the previous to the current step by render_alpha"""
+        alpha = CircleShape.render_alpha
+        position = self.position
+        if alpha >= 1:
+            return position
+        prev = self.prev_position
+        dx = position.x - prev.x
+        dy = position.y - prev.y
+        # A jump of over half the world is a wrap around the edge, not motion to draw through
+        world = CircleShape.world
+        if abs(dx) > world.width / 2 or abs(dy) > world.height / 2:
+            return position
+        return pygame.Vector2(prev.x + dx * alpha, prev.y + dy * alpha)
+
+    def screen_position(self):
+        """render_position() relative to the camera"""
+        position = self.render_position()
+        camera = CircleShape.camera
+        if camera is None or not (camera.x or camera.y):
+            return position
+        return pygame.Vector2(position.x - camera.x, position.y - camera.y)
 
-    def update(self, dt):
-        # sub-classes must override
-        pass
+    def on_screen(self, position, reach):
+        """Whether anything within reach of a screen position shows, so drawing can be skipped when not"""
+        camera = CircleShape.camera
+        return camera is None or camera.shows(position.x, position.y, reach)
 
     def check_collision(self, other_circle):
         # Calculate distance between this circle and another circle
@@ -29,15 +51,5 @@ class CircleShape(pygame.sprite.Sprite):
         return distance <= (self.radius + other_circle.radius)
 
     def wrap_position(self):
-        """Wrap the object's position around the screen edges"""
-        # Wrap horizontally
-        if self.position.x < -self.radius:
-            self.position.x = SCREEN_WIDTH + self.radius
-        elif self.position.x > SCREEN_WIDTH + self.radius:
-            self.position.x = -self.radius
-
-        # Wrap vertically
-        if self.position.y < -self.radius:
-            self.position.y = SCREEN_HEIGHT + self.radius
-        elif self.position.y > SCREEN_HEIGHT + self.radius:
-            self.position.y = -self.radius
\ No newline at end of file
+        """Wrap the object's position around the world edges"""
+        CircleShape.world.wrap(self.position)
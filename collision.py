@@ -0,0 +1,356 @@
+import math
+import numpy as np
+import constants
+from constants import *
+
+class SpatialHash:
+    """Uniform grid broadphase whose cell indices wrap around the screen edges.
+
+    Objects are bucketed by the cell holding their centre. Indices are taken
+    modulo the grid size, so objects that sit past an edge (spawning asteroids,
+    or anything just across the wrap seam) still land in a valid cell, and
+    neighbouring cells on either side of the seam are searched together.
+    """
+
+    def __init__(self, cell_size, width, height):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.cells = {}  # (col, row) -> list of item indices
+        self.max_radius = 0
+
+    def clear(self):
+        self.cells.clear()
+        self.max_radius = 0
+
+    def insert(self, index, x, y, radius):
+        cell = (math.floor(x / self.cell_size) % self.cols,
+                math.floor(y / self.cell_size) % self.rows)
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            self.cells[cell] = [index]
+        else:
+            bucket.append(index)
+        if radius > self.max_radius:
+            self.max_radius = radius
+
+    def build(self, centers, radii):
+        self.clear()
+        for index, ((x, y), radius) in enumerate(zip(centers, radii)):
+            self.insert(index, x, y, radius)
+
+    def query(self, x, y, radius):
+        """Return the sorted indices of every object that could touch the given circle"""
+        reach = radius + self.max_radius
+        cols = self._span(x - reach, x + reach, self.cols)
+        rows = self._span(y - reach, y + reach, self.rows)
+        candidates = []
+        for col in cols:
+            for row in rows:
+                bucket = self.cells.get((col, row))
+                if bucket:
+                    candidates.extend(bucket)
+        # Keep the original group order so hits resolve exactly like the brute-force pass
+        candidates.sort()
+        return candidates
+
+    def _span(self, low, high, count):
+        first = math.floor(low / self.cell_size)
+        last = math.floor(high / self.cell_size)
+        if last - first + 1 >= count:
+            return range(count)
+        return {cell % count for cell in range(first, last + 1)}
+
+def circles(objects):
+    """Return the centres (as (x, y) pairs) and radii of a list of circle shapes.
+
+    Objects backed by a struct-of-arrays store (asteroids) are read with one
+    gather from its arrays instead of one property lookup each.
+    """
+    store = getattr(objects[0], 'store', None) if objects else None
+    if store is not None:
+        slots = [obj.slot for obj in objects]
+        if min(slots) >= 0:
+            return store.position[slots].tolist(), store.radius[slots].tolist()
+    centers = []
+    radii = []
+    for obj in objects:
+        position = obj.position
+        centers.append((position.x, position.y))
+        radii.append(obj.radius)
+    return centers, radii
+
+def circle_arrays(objects):
+    """Like circles(), but as an (n, 2) array of centres and an (n,) array of radii"""
+    store = getattr(objects[0], 'store', None) if objects else None
+    if store is not None:
+        slots = [obj.slot for obj in objects]
+        if min(slots) >= 0:
+            return store.position[slots], store.radius[slots]
+    centers, radii = circles(objects)
+    return np.array(centers, dtype=float).reshape(-1, 2), np.array(radii, dtype=float)
+
+def overlaps(centers_a, radii_a, centers_b, radii_b):
+    """Boolean (len(a), len(b)) matrix of which circles overlap, from squared distances"""
+    # Per-axis outer differences, squared and summed in place to keep temporaries few
+    distance_squared = np.subtract.outer(centers_a[:, 0], centers_b[:, 0])
+    dy = np.subtract.outer(centers_a[:, 1], centers_b[:, 1])
+    distance_squared *= distance_squared
+    dy *= dy
+    distance_squared += dy
+    reach = np.add.outer(radii_a, radii_b)
+    reach *= reach
+    return distance_squared <= reach
+
+def motion_arrays(objects, width, height):
+    """Start and end centres over the last step, as (n, 2) arrays, plus radii.
+
+    Starts come from prev_position. An object that wrapped around an edge
+    this step is treated as not moving, starting where it ended.
+    """
+    store = getattr(objects[0], 'store', None) if objects else None
+    if store is not None and min(obj.slot for obj in objects) >= 0:
+        slots = [obj.slot for obj in objects]
+        starts, ends, radii = store.prev_position[slots], store.position[slots], store.radius[slots]
+    else:
+        starts = np.array([(obj.prev_position.x, obj.prev_position.y) for obj in objects], dtype=float).reshape(-1, 2)
+        ends, radii = circle_arrays(objects)
+    wrapped = (np.abs(ends - starts) > (width / 2, height / 2)).any(axis=1)
+    if wrapped.any():
+        starts[wrapped] = ends[wrapped]
+    return starts, ends, radii
+
+def times_of_impact(starts_a, ends_a, radii_a, starts_b, ends_b, radii_b):
+    """(len(a), len(b)) matrix of the earliest time in [0, 1] of the step at which
+    each pair of circles, moving in straight lines, first touches; inf where they never do"""
+    # Relative position at the start and relative motion over the step, per axis
+    dx = np.subtract.outer(starts_a[:, 0], starts_b[:, 0])
+    dy = np.subtract.outer(starts_a[:, 1], starts_b[:, 1])
+    moved_a = ends_a - starts_a
+    moved_b = ends_b - starts_b
+    vx = np.subtract.outer(moved_a[:, 0], moved_b[:, 0])
+    vy = np.subtract.outer(moved_a[:, 1], moved_b[:, 1])
+    reach = np.add.outer(radii_a, radii_b)
+
+    # |d + t v| = reach  ->  a t^2 + 2 b t + c = 0
+    a = vx * vx + vy * vy
+    b = dx * vx + dy * vy
+    c = dx * dx + dy * dy - reach * reach
+    discriminant = b * b - a * c
+    approaching = (c > 0) & (b < 0) & (discriminant >= 0)
+    t = (-b - np.sqrt(np.maximum(discriminant, 0))) / np.where(approaching, a, 1)
+    times = np.full(c.shape, np.inf)
+    times[approaching & (t <= 1)] = t[approaching & (t <= 1)]
+    times[c <= 0] = 0.0  # Already touching at the start of the step
+    return times
+
+class CollisionSystem:
+    """Finds player/asteroid and shot/asteroid hits for one frame.
+
+    Both passes return hits in the order the original nested loops would
+    have produced them, so callers can apply them one by one with the same
+    side effects. Passes with at most kernel_max_pairs possible pairs test
+    all of them at once with the NumPy kernel; above that the spatial hash
+    prunes enough pairs to win (see benchmarks/bench_collision.py). In
+    continuous mode shots are instead swept against moving asteroids over
+    the whole step (always with the kernel), and each shot hits the
+    asteroid it would reach first. With the
+    narrowphase on, asteroids take part in those passes with a circle
+    around their whole outline, and each candidate pair is then confirmed
+    against the outline itself. In debug mode every result is cross-checked
+    against the brute-force pass.
+    """
+
+    def __init__(self, width=None, height=None, cell_size=COLLISION_CELL_SIZE,
+                 broadphase=COLLISION_BROADPHASE, kernel_max_pairs=COLLISION_KERNEL_MAX_PAIRS,
+                 narrowphase=COLLISION_POLYGON_NARROWPHASE, continuous=COLLISION_CONTINUOUS,
+                 debug=COLLISION_DEBUG):
+        # The screen size by default, resolved only when a system is made
+        width = constants.SCREEN_WIDTH if width is None else width
+        height = constants.SCREEN_HEIGHT if height is None else height
+        self.width = width
+        self.height = height
+        self.asteroid_grid = SpatialHash(cell_size, width, height)
+        self.shot_grid = SpatialHash(cell_size, width, height)
+        self.broadphase = broadphase
+        self.kernel_max_pairs = kernel_max_pairs  # None disables the kernel
+        self.narrowphase = narrowphase
+        self.asteroid_reach = ASTEROID_MAX_VARIATION if narrowphase else 1  # Bounding circle per unit of radius
+        self.continuous = continuous
+        self.debug = debug
+        self.mismatches = 0
+
+    def use_kernel(self, count_a, count_b):
+        return self.kernel_max_pairs is not None and count_a * count_b <= self.kernel_max_pairs
+
+    def touches(self, obj, asteroid):
+        """Whether a circle shape hits an asteroid, by its outline when the narrowphase is on"""
+        if self.narrowphase:
+            return asteroid.overlaps_circle(obj.position, obj.radius)
+        return obj.check_collision(asteroid)
+
+    def asteroid_circles(self, asteroids):
+        centers, radii = circles(asteroids)
+        if self.narrowphase:
+            radii = [radius * self.asteroid_reach for radius in radii]
+        return centers, radii
+
+    def player_hits(self, players, asteroids):
+        """Return (player, asteroid) pairs, ordered by asteroid then player"""
+        asteroids = list(asteroids)
+        if self.use_kernel(len(players), len(asteroids)):
+            hits = self.kernel_player_hits(players, asteroids)
+            if self.debug:
+                hits = self._cross_check('player', hits, self.brute_force_player_hits(players, asteroids))
+            return hits
+        if not self.broadphase:
+            return self.brute_force_player_hits(players, asteroids)
+
+        self.asteroid_grid.build(*self.asteroid_circles(asteroids))
+        found = []
+        for player_index, player in enumerate(players):
+            position = player.position
+            for asteroid_index in self.asteroid_grid.query(position.x, position.y, player.radius):
+                if self.touches(player, asteroids[asteroid_index]):
+                    found.append((asteroid_index, player_index))
+        found.sort()
+        hits = [(players[p], asteroids[a]) for a, p in found]
+
+        if self.debug:
+            hits = self._cross_check('player', hits, self.brute_force_player_hits(players, asteroids))
+        return hits
+
+    def shot_hits(self, shots, asteroids):
+        """Return (shot, asteroid) pairs; a shot is consumed by the first asteroid it hits"""
+        shots = list(shots)
+        asteroids = list(asteroids)
+        if self.continuous:
+            return [(shot, asteroid) for shot, asteroid, _ in self.swept_shot_hits(shots, asteroids)]
+        if self.use_kernel(len(shots), len(asteroids)):
+            hits = self.kernel_shot_hits(shots, asteroids)
+            if self.debug:
+                hits = self._cross_check('shot', hits, self.brute_force_shot_hits(shots, asteroids))
+            return hits
+        if not self.broadphase:
+            return self.brute_force_shot_hits(shots, asteroids)
+
+        self.shot_grid.build(*circles(shots))
+        consumed = [False] * len(shots)
+        hits = []
+        centers, radii = self.asteroid_circles(asteroids)
+        for asteroid, (x, y), radius in zip(asteroids, centers, radii):
+            for shot_index in self.shot_grid.query(x, y, radius):
+                shot = shots[shot_index]
+                if consumed[shot_index]:
+                    continue
+                # Same test as shot.check_collision(asteroid), without reading the asteroid back
+                if shot.position.distance_to((x, y)) > shot.radius + radius:
+                    continue
+                if not self.narrowphase or asteroid.overlaps_circle(shot.position, shot.radius):
+                    consumed[shot_index] = True
+                    hits.append((shot, asteroid))
+
+        if self.debug:
+            hits = self._cross_check('shot', hits, self.brute_force_shot_hits(shots, asteroids))
+        return hits
+
+    def kernel_circles(self, asteroids):
+        centers, radii = circle_arrays(asteroids)
+        if self.narrowphase:
+            radii = radii * self.asteroid_reach
+        return centers, radii
+
+    def kernel_player_hits(self, players, asteroids):
+        if not asteroids:
+            return []
+        hit = overlaps(*self.kernel_circles(asteroids), *circle_arrays(players))
+        if self.narrowphase:
+            self._refine(hit, asteroids, players)
+        # argwhere walks the matrix row by row: asteroid-major, then player
+        return [(players[p], asteroids[a]) for a, p in np.argwhere(hit).tolist()]
+
+    def kernel_shot_hits(self, shots, asteroids):
+        if not shots or not asteroids:
+            return []
+        hit = overlaps(*self.kernel_circles(asteroids), *circle_arrays(shots))
+        if self.narrowphase:
+            self._refine(hit, asteroids, shots)
+        hits = []
+        consumed = np.zeros(len(shots), dtype=bool)
+        # Only asteroids with at least one overlapping shot need resolving, in group order
+        for a in np.flatnonzero(hit.any(axis=1)).tolist():
+            row = hit[a] & ~consumed
+            for shot_index in np.flatnonzero(row).tolist():
+                hits.append((shots[shot_index], asteroids[a]))
+            consumed |= row
+        return hits
+
+    def swept_shot_hits(self, shots, asteroids):
+        """Return (shot, asteroid, time of impact) for shots that touched an asteroid at any
+        point of the last step, each with the asteroid it reached first; time is a fraction of the step"""
+        if not shots or not asteroids:
+            return []
+        starts_a, ends_a, radii_a = motion_arrays(asteroids, self.width, self.height)
+        starts_s, ends_s, radii_s = motion_arrays(shots, self.width, self.height)
+        times = times_of_impact(starts_a, ends_a, radii_a * self.asteroid_reach, starts_s, ends_s, radii_s)
+        if self.narrowphase:
+            self._refine_swept(times, asteroids, shots, starts_a, ends_a, starts_s, ends_s)
+
+        first = times.argmin(axis=0)  # Earliest asteroid for every shot
+        hit = np.isfinite(times[first, np.arange(len(shots))])
+        # In group order, asteroid by asteroid, like the other passes
+        order = sorted(zip(first[hit].tolist(), np.flatnonzero(hit).tolist()))
+        return [(shots[s], asteroids[a], float(times[a, s])) for a, s in order]
+
+    def _refine_swept(self, times, asteroids, shots, starts_a, ends_a, starts_s, ends_s):
+        # Swept bounding circles only give candidates: walk each candidate pair from its time
+        # of impact to the end of the step, in moves no longer than the shot's radius, until
+        # the shot touches the outline (with the asteroid's current rotation)
+        for a, s in np.argwhere(np.isfinite(times)).tolist():
+            shot = shots[s]
+            start = starts_s[s] - starts_a[a]
+            motion = (ends_s[s] - ends_a[a]) - start
+            t = times[a, s]
+            samples = max(1, math.ceil(math.hypot(*motion) * (1 - t) / max(shot.radius, 1)))
+            times[a, s] = np.inf
+            for i in range(samples + 1):
+                sample = t + (1 - t) * i / samples
+                dx, dy = start + motion * sample
+                if asteroids[a].overlaps_offset(dx, dy, shot.radius):
+                    times[a, s] = sample
+                    break
+
+    def _refine(self, hit, asteroids, others):
+        # Overlapping bounding circles are only candidates: keep the pairs that reach the outline
+        for a, o in np.argwhere(hit).tolist():
+            other = others[o]
+            if not asteroids[a].overlaps_circle(other.position, other.radius):
+                hit[a, o] = False
+
+    def brute_force_player_hits(self, players, asteroids):
+        hits = []
+        for asteroid in asteroids:
+            for player in players:
+                if self.touches(player, asteroid):
+                    hits.append((player, asteroid))
+        return hits
+
+    def brute_force_shot_hits(self, shots, asteroids):
+        hits = []
+        remaining = list(shots)
+        for asteroid in asteroids:
+            survivors = []
+            for shot in remaining:
+                if self.touches(shot, asteroid):
+                    hits.append((shot, asteroid))
+                else:
+                    survivors.append(shot)
+            remaining = survivors
+        return hits
+
+    def _cross_check(self, name, hits, expected):
+        if hits != expected:
+            self.mismatches += 1
+            print(f"Warning: {name} broadphase found {len(hits)} hits, brute force found {len(expected)}")
+            return expected
+        return hits
\ No newline at end of file
@@ -1,21 +1,61 @@
+import os
+import time
 import pygame
 
-# Initialize pygame just for display info
-pygame.init()
-info = pygame.display.Info()
-# Get the screen resolution
-SCREEN_WIDTH = info.current_w
-SCREEN_HEIGHT = info.current_h
-pygame.quit()
+# Headless simulation mode (no window, no audio), switched on through the environment
+HEADLESS = os.environ.get("ASTEROIDS_HEADLESS") == "1"
+HEADLESS_RESOLUTION = os.environ.get("ASTEROIDS_RESOLUTION", "1920x1080")
+SIMULATION_DT = 1 / 60  # Fixed timestep used by Game.simulate
+
+# Live game loop: the simulation advances in fixed steps and each frame draws between the last two
+FIXED_TIMESTEP = True  # False steps once per frame by the measured frame time
+SIMULATION_HZ = 120  # Fixed steps per second
+MAX_CATCH_UP_STEPS = 8  # Most steps run in one frame; any further backlog is dropped instead of spiraling
+RENDER_FPS = 60  # Frame-rate cap, 0 for unlocked
+
+if HEADLESS:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Playfield size in pixels; None makes it the screen size. A bigger world is shown through a camera that follows both ships
+WORLD_WIDTH = None
+WORLD_HEIGHT = None
+
+RESOLUTION_TIME = 0.0  # Seconds spent resolving the screen size, for the startup breakdown
+
+def __getattr__(name):
+    # The screen size is resolved on first use (PEP 562), so importing this module never touches the display
+    global SCREEN_WIDTH, SCREEN_HEIGHT, RESOLUTION_TIME
+    if name not in ("SCREEN_WIDTH", "SCREEN_HEIGHT"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    start = time.perf_counter()
+    if HEADLESS:
+        SCREEN_WIDTH, SCREEN_HEIGHT = (int(v) for v in HEADLESS_RESOLUTION.lower().split("x"))
+    else:
+        # Only the display module is needed, and it stays initialized for the game window
+        pygame.display.init()
+        info = pygame.display.Info()
+        SCREEN_WIDTH = info.current_w
+        SCREEN_HEIGHT = info.current_h
+    RESOLUTION_TIME = time.perf_counter() - start
+    return globals()[name]
 
 # Asset paths
 BACKGROUND_IMAGE_PATH = "pics/background_stars.jpg"
+ASSET_CACHE = True  # Keep the scaled background and decoded sounds on disk for faster launches
+ASSET_CACHE_DIR = ".asset_cache"
 
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE = 2.0  # seconds
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
 
+# Asteroid population, with mass counted in radius kinds (big 3, medium 2, small 1)
+ASTEROID_MAX_MASS = 90  # Spawning stops while the live asteroids weigh this much
+ASTEROID_THROTTLE_MASS = 60  # Above this mass, spawns come ASTEROID_SPAWN_THROTTLE times less often
+ASTEROID_SPAWN_THROTTLE = 2.0
+ASTEROID_SPAWN_FRAME_MS = 14.0  # Defer spawns while the smoothed frame work time is above this (0 disables)
+ASTEROID_SPAWN_RETRY = 0.5  # Seconds before a deferred spawn is tried again
+
 # Player movement
 PLAYER_TURN_SPEED = 360  # Degrees per second
 PLAYER_SPEED = 200
@@ -40,6 +80,8 @@ ASTEROID_MIN_POINTS = 8  # Minimum number of points for lumpy shape
 ASTEROID_MAX_POINTS = 12  # Maximum number of points for lumpy shape
 ASTEROID_MIN_VARIATION = 0.7  # Minimum radius multiplier for lumpiness
 ASTEROID_MAX_VARIATION = 1.3  # Maximum radius multiplier for lumpiness
+ASTEROID_SHAPE_VARIANTS = 12  # Pre-generated shapes per asteroid size, shared by every asteroid that picks them
+ASTEROID_SHAPE_SEED = 0  # Seed of the shape library, so every game draws from the same shapes
 
 # Asteroid lighting
 LIGHT_DIRECTION = pygame.Vector2(1, -1)  # Light coming from top-right
@@ -48,6 +90,20 @@ AMBIENT_LIGHT = 0.3   # Minimum light level
 CRATER_DEPTH = 0.4    # How "deep" craters appear
 BUMP_HEIGHT = 0.2     # How "high" surface bumps appear
 
+# Asteroid sprite cache
+ASTEROID_SPRITE_CACHE = True  # Draw from pre-rotated frames (False renders every frame, F2 toggles)
+ASTEROID_ROTATION_BUCKETS = 72  # Number of pre-rotated frames per shape (5 degree steps)
+ASTEROID_SPRITE_CACHE_MB = 128  # Memory budget for cached frames before LRU eviction
+
+# Asteroid level of detail
+LOD_ENABLED = True  # Drop asteroid detail while frames run over budget (F5 toggles)
+LOD_TARGET_FRAME_MS = 12.0  # Work time per frame to stay under, leaving headroom in a 60 FPS frame
+LOD_SMOOTHING = 0.1  # Weight of the newest frame in the moving average of frame time
+LOD_RAISE_RATIO = 1.0  # Drop detail while the average is above this fraction of the target
+LOD_LOWER_RATIO = 0.6  # Restore detail once the average is below this fraction of the target
+LOD_HOLD_FRAMES = 30  # Minimum frames between detail changes
+LOD_DIRECT_MIN_RADIUS = 40  # Smaller cached asteroids blit faster than drawing their flat or outline tier, so LOD leaves them alone
+
 # Explosion effects
 EXPLOSION_PARTICLE_COUNT = 12
 EXPLOSION_PARTICLE_SPEED = 200
@@ -61,10 +117,29 @@ EXHAUST_PARTICLE_SIZE = 3
 EXHAUST_SPAWN_RATE = 0.01  # seconds between particles
 EXHAUST_COLOR = (255, 165, 0)  # Brighter orange
 
+# Collision detection
+COLLISION_BROADPHASE = True  # Use the spatial hash instead of testing every pair
+COLLISION_CELL_SIZE = ASTEROID_MAX_RADIUS * 2  # Spatial hash cell size in pixels
+COLLISION_KERNEL_MAX_PAIRS = 50000  # Test every pair at once with NumPy up to this many pairs, above it use the spatial hash (None disables)
+COLLISION_POLYGON_NARROWPHASE = False  # Confirm circle hits against the asteroid's lumpy outline (changes gameplay, so off)
+COLLISION_CONTINUOUS = False  # Sweep shots against moving asteroids over each step, so coarse timesteps can't tunnel
+COLLISION_DEBUG = False  # Cross-check every broadphase result against the brute-force pass
+
+# Rendering
+DIRTY_RECT_RENDERING = True  # Only restore and update changed regions (F4 toggles)
+DIRTY_RECT_MAX_COVERAGE = 0.4  # Fall back to a full flip when dirty rects cover more of the screen than this
+DIRTY_RECT_PADDING = 1  # Pixels added around every dirty rect
+
+# Frame profiler
+PROFILER_WINDOW = 600  # Frames of history kept for the rolling percentiles
+PROFILER_FONT_SIZE = 16
+PROFILER_OVERLAY_REFRESH = 0.25  # Seconds between overlay text refreshes
+
 # Score display
 SCORE_FONT_SIZE = 32
 SCORE_PADDING = 20  # Padding from screen edges
 SCORE_POINTS = 100  # Points per asteroid hit
+HUD_STATUS_FONT_SIZE = 22  # Super-attack cooldown and stun text under the scores
 
 # Stun settings
 PLAYER_STUN_DURATION = 1.0
@@ -92,6 +167,12 @@ SUPER_ATTACK_COOLDOWN = 10.0  # Cooldown in seconds
 SUPER_ATTACK_BULLETS = 64     # number of bullets
 SUPER_ATTACK_SPEED = 350      # Slightly increased speed
 
+# Object pools
+POOL_PREWARM = True  # Fill the pools at startup
+SHOT_POOL_PREWARM = SUPER_ATTACK_BULLETS * 2 + 32  # Enough for both players' super attacks
+ASTEROID_POOL_PREWARM = 64
+EXPLOSION_POOL_PREWARM = 16
+
 # Sound settings
 SOUND_ENABLED = True
 SOUND_VOLUME = 0.3  # Global volume multiplier
@@ -101,6 +182,19 @@ EXPLOSION_SOUND_VOLUME = 0.45
 STUN_SOUND_VOLUME = 0.4
 MUSIC_VOLUME = 0.25  # Lower volume for background music
 
+# Sound voices
+SOUND_CHANNELS = 12  # Mixer channels for sound effects
+SOUND_COALESCE_WINDOW = 0.05  # Seconds in which repeats of the same sound are merged into one
+SOUND_VOICES = {  # Sound name -> (category, priority); higher priority steals from lower
+    'standard_attack': ('attack', 1),
+    'super_attack': ('super', 3),
+    'big_explosion': ('explosion', 2),
+    'medium_explosion': ('explosion', 2),
+    'small_explosion': ('explosion', 1),
+    'stunned': ('stun', 3),
+}
+SOUND_CATEGORY_VOICES = {'attack': 4, 'explosion': 6, 'super': 2, 'stun': 2}  # Voice cap per category
+
 # Sound file paths
 SOUND_STANDARD_ATTACK = "sounds/standard_attack.wav"
 SOUND_SUPER_ATTACK = "sounds/super_attack.wav"
@@ -112,3 +206,8 @@ SOUND_STUNNED = "sounds/stunned.wav"
 # Music file paths
 MUSIC_THEME_1 = "sounds/background-theme-1.wav"
 MUSIC_THEME_2 = "sounds/background-theme-2.wav"
+MUSIC_CROSSFADE = 3.0  # Seconds the end of one theme overlaps the start of the next
+MUSIC_PREFETCH_LEAD = 20.0  # Seconds before a theme ends that the next one starts decoding (both are in memory from then)
+
+# Star imports leave out the screen size, so they never touch the display; read constants.SCREEN_WIDTH/HEIGHT instead
+__all__ = [name for name in list(globals()) if name.isupper()]
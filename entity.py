@@ -0,0 +1,132 @@
+class Entity:
+    """Base of every game object: fields in __slots__, membership in an EntityRegistry instead of sprite groups.
+
+    An entity joins a registry through EntityRegistry.add() (whoever spawns
+    it adds it to their own registry) and kill() takes it out again. It
+    keeps a reference to that registry after kill(), so anything it still
+    spawns (an asteroid hit twice in one step splits twice) joins the same
+    game. A
+    subclass that declares __slots__ for its fields carries no per-instance
+    __dict__; one that doesn't (the two players, the asteroid field) still
+    works, with a __dict__ like any object.
+    """
+    __slots__ = ('registry', 'index')
+
+    def __init__(self):
+        self.registry = None  # Registry this entity last joined, None if it never joined one
+        self.index = -1  # Slot in the registry's dense list for this type, -1 while not in it
+
+    def update(self, dt):
+        # sub-classes must override
+        pass
+
+    def draw(self, screen):
+        # sub-classes must override
+        pass
+
+    def kill(self):
+        if self.index >= 0:
+            self.registry.remove(self)
+
+    def alive(self):
+        return self.index >= 0
+
+class EntityRegistry:
+    """Entities stored per type in dense lists, with O(1) swap-remove deletion.
+
+    Any object with writable `registry` and `index` attributes can be
+    registered. Entity.kill() leaves the registry; other objects have to be
+    taken out with remove(). Removal moves the type's last entity into the
+    freed slot, so iteration order is not insertion order.
+    """
+
+    def __init__(self):
+        self.lists = {}  # type -> dense list of live entities
+
+    def add(self, entity):
+        """Register an entity and return it"""
+        entities = self.lists.get(type(entity))
+        if entities is None:
+            entities = self.lists[type(entity)] = []
+        entity.registry = self
+        entity.index = len(entities)
+        entities.append(entity)
+        return entity
+
+    def remove(self, entity):
+        entities = self.lists[type(entity)]
+        # Move the last entity into the freed slot instead of shifting the list
+        last = entities.pop()
+        if last is not entity:
+            entities[entity.index] = last
+            last.index = entity.index
+        entity.index = -1
+
+    def of_type(self, cls):
+        """The live dense list for one type; do not add or remove while iterating it"""
+        return self.lists.get(cls, [])
+
+    def __len__(self):
+        return sum(len(entities) for entities in self.lists.values())
+
+    def update(self, dt):
+        for entities in list(self.lists.values()):
+            # Walk backwards: a swap-remove only ever moves in an entity that was already updated
+            for i in range(len(entities) - 1, -1, -1):
+                if i < len(entities):
+                    entities[i].update(dt)
+
+    def draw(self, screen):
+        for entities in self.lists.values():
+            for entity in entities:
+                entity.draw(screen)
+
+class RegistryGroup:
+    """Sprite-Group-like view over some entity types of one registry, for code that expects groups.
+
+    Membership is by type, so an entity in the registry is in every group
+    viewing its type.
+
+    Supports iteration (over a snapshot, so killing while iterating is safe),
+    len(), sprites(), add(), remove(), has() and empty().
+    """
+
+    def __init__(self, registry, *types):
+        self.registry = registry
+        self.types = types
+
+    def sprites(self):
+        result = []
+        for cls in self.types:
+            result.extend(self.registry.of_type(cls))
+        return result
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return sum(len(self.registry.of_type(cls)) for cls in self.types)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def add(self, *entities):
+        for entity in entities:
+            if entity.index < 0:
+                self.registry.add(entity)
+
+    def remove(self, *entities):
+        for entity in entities:
+            if self.has(entity):
+                self.registry.remove(entity)
+
+    def has(self, entity):
+        return entity.registry is self.registry and entity.index >= 0 and type(entity) in self.types
+
+    def empty(self):
+        for entity in self.sprites():
+            self.registry.remove(entity)
+
+    def update(self, dt):
+        for entity in self.sprites():
+            entity.update(dt)
\ No newline at end of file
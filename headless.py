@@ -0,0 +1,53 @@
+"""Pieces shared by the headless command-line tools (sweep.py, snapshot.py).
+
+Nothing here imports the game at module level, so the tools can set the
+headless environment and patch constants before the game loads.
+"""
+import multiprocessing
+import os
+import random
+
+class Bot:
+    """Seeded stand-in for two players: keeps firing, and every half second or so
+    picks a new turn direction and thrust, with the odd super attack"""
+
+    def __init__(self, seed):
+        self.rand = random.Random(f"{seed}:bot")
+        self.held = [0, 0]
+        self.hold_steps = [0, 0]
+
+    def mask(self):
+        import inputs
+        masks = []
+        for player in range(2):
+            if self.hold_steps[player] <= 0:
+                held = 1 << inputs.CONTROL_NAMES.index('shoot')
+                turn = self.rand.choice((None, 'left', 'right'))
+                if turn:
+                    held |= 1 << inputs.CONTROL_NAMES.index(turn)
+                if self.rand.random() < 0.5:
+                    held |= 1 << inputs.CONTROL_NAMES.index('forward')
+                self.held[player] = held
+                self.hold_steps[player] = self.rand.randint(15, 45)
+            self.hold_steps[player] -= 1
+            mask = self.held[player]
+            if self.rand.random() < 0.005:
+                mask |= 1 << inputs.CONTROL_NAMES.index('super')
+            masks.append(mask)
+        return inputs.combine(*masks)
+
+def run_in_processes(function, cases, workers, **pool_options):
+    """Map function over cases in spawned worker processes and return the results in order.
+
+    Spawned rather than forked, so each worker imports the game itself after
+    its own setup; pool_options (initializer, maxtasksperchild, ...) are
+    passed on to the Pool.
+    """
+    os.environ["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    pool = multiprocessing.get_context("spawn").Pool(processes=min(workers, len(cases)), **pool_options)
+    try:
+        return pool.map(function, cases, chunksize=1)
+    finally:
+        # close() and join() rather than the context manager's terminate(), which can hang while workers exit
+        pool.close()
+        pool.join()
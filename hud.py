@@ -0,0 +1,114 @@
+import math
+import pygame
+from constants import *
+
+class GlyphCache:
+    """Characters rendered once per color and composed into strings by blitting"""
+
+    def __init__(self, font):
+        self.font = font
+        self.glyphs = {}  # (char, color) -> Surface
+
+    def glyph(self, char, color):
+        key = (char, color)
+        surface = self.glyphs.get(key)
+        if surface is None:
+            surface = self.glyphs[key] = self.font.render(char, True, color)
+        return surface
+
+    def compose(self, text, color):
+        glyphs = [self.glyph(char, color) for char in text]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        surface = pygame.Surface((max(1, width), self.font.get_height()), pygame.SRCALPHA)
+        x = 0
+        for glyph in glyphs:
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surface
+
+class HudElement:
+    """A piece of HUD text that is only re-composed when its value changes.
+
+    Subclasses provide value() and the text for a value; align picks which
+    edge of the element sits at (x, y).
+    """
+
+    def __init__(self, glyphs, color, x, y, align='left'):
+        self.glyphs = glyphs
+        self.color = color
+        self.x = x
+        self.y = y
+        self.align = align
+        self.current = None
+        self.surface = None
+
+    def value(self):
+        # sub-classes must override
+        pass
+
+    def text(self, value):
+        return str(value)
+
+    def draw(self, screen):
+        value = self.value()
+        if self.surface is None or value != self.current:
+            self.current = value
+            self.surface = self.glyphs.compose(self.text(value), self.color)
+        x = self.x - self.surface.get_width() if self.align == 'right' else self.x
+        return screen.blit(self.surface, (x, self.y))
+
+class ScoreElement(HudElement):
+    def __init__(self, glyphs, player, x, y, align='left'):
+        super().__init__(glyphs, player.color, x, y, align)
+        self.player = player
+
+    def value(self):
+        return self.player.score
+
+class SuperCooldownElement(HudElement):
+    def __init__(self, glyphs, player, x, y, align='left'):
+        super().__init__(glyphs, player.color, x, y, align)
+        self.player = player
+
+    def value(self):
+        # Tenths of a second, so the text changes at most ten times per second
+        return max(0, math.ceil(self.player.super_timer * 10))
+
+    def text(self, value):
+        return "SUPER READY" if value == 0 else f"SUPER {value / 10:.1f}"
+
+class StunElement(HudElement):
+    def __init__(self, glyphs, player, x, y, align='left'):
+        super().__init__(glyphs, player.color, x, y, align)
+        self.player = player
+
+    def value(self):
+        return self.player.is_stunned
+
+    def text(self, value):
+        return "STUNNED" if value else " "
+
+class Hud:
+    """Score, super-attack cooldown and stun state for both players"""
+
+    def __init__(self, player1, player2, width):
+        score_glyphs = GlyphCache(pygame.font.Font(None, SCORE_FONT_SIZE))
+        status_glyphs = GlyphCache(pygame.font.Font(None, HUD_STATUS_FONT_SIZE))
+        status_y = SCORE_PADDING + score_glyphs.font.get_height()
+        stun_y = status_y + status_glyphs.font.get_height()
+        right = width - SCORE_PADDING
+
+        self.elements = [
+            # Player 1 (left side)
+            ScoreElement(score_glyphs, player1, SCORE_PADDING, SCORE_PADDING),
+            SuperCooldownElement(status_glyphs, player1, SCORE_PADDING, status_y),
+            StunElement(status_glyphs, player1, SCORE_PADDING, stun_y),
+            # Player 2 (right side)
+            ScoreElement(score_glyphs, player2, right, SCORE_PADDING, align='right'),
+            SuperCooldownElement(status_glyphs, player2, right, status_y, align='right'),
+            StunElement(status_glyphs, player2, right, stun_y, align='right'),
+        ]
+
+    def draw(self, screen):
+        """Draw every element and return the rects they cover"""
+        return [element.draw(screen) for element in self.elements]
\ No newline at end of file
@@ -0,0 +1,28 @@
+# Player controls packed into bitmasks, so input can be recorded and replayed
+
+# Order of the control bits in one player's mask
+CONTROL_NAMES = ('left', 'right', 'forward', 'backward', 'shoot', 'super')
+CONTROL_BITS = len(CONTROL_NAMES)
+PLAYER_MASK = (1 << CONTROL_BITS) - 1
+
+def encode(pressed, controls):
+    """Pack the pressed state of a player's control keys into a mask"""
+    mask = 0
+    for bit, name in enumerate(CONTROL_NAMES):
+        if pressed[controls[name]]:
+            mask |= 1 << bit
+    return mask
+
+def decode(mask):
+    """Unpack a player's mask into a dict of control name -> pressed"""
+    return {name: bool(mask >> bit & 1) for bit, name in enumerate(CONTROL_NAMES)}
+
+def player_mask(mask, player_index):
+    """Extract one player's controls from a combined mask (player 1 in the low bits)"""
+    return mask >> (player_index * CONTROL_BITS) & PLAYER_MASK
+
+def combine(*player_masks):
+    mask = 0
+    for index, player in enumerate(player_masks):
+        mask |= player << (index * CONTROL_BITS)
+    return mask
@@ -0,0 +1,89 @@
+import math
+from constants import (ASTEROID_MIN_RADIUS, ASTEROID_KINDS, ASTEROID_SPRITE_CACHE, LOD_ENABLED, LOD_TARGET_FRAME_MS,
+                       LOD_SMOOTHING, LOD_RAISE_RATIO, LOD_LOWER_RATIO, LOD_HOLD_FRAMES, LOD_DIRECT_MIN_RADIUS)
+
+# Asteroid detail tiers, from most to least expensive to draw
+LOD_FULL = 0  # Lit faces, craters and surface bumps
+LOD_NO_NOISE = 1  # Lit faces and craters; skipped with the sprite cache, which blits full detail at the same cost
+LOD_FLAT = 2  # One flat-shaded polygon, drawn straight onto the screen
+LOD_OUTLINE = 3  # Polygon outline only, drawn straight onto the screen
+LOD_TIERS = (LOD_FULL, LOD_NO_NOISE, LOD_FLAT, LOD_OUTLINE)
+
+class LodController:
+    """Picks asteroid detail tiers from the recent frame cost.
+
+    A smoothed (exponential moving average) frame time drives a global
+    pressure level. The level goes up one step while frames run over the
+    target budget and down one step once they are comfortably under it,
+    never more often than every hold_frames frames. Each asteroid's tier is
+    the level minus a bonus for its size, so the smallest asteroids that can
+    simplify lose detail first and the biggest keep it longest.
+
+    Only tiers that change what is drawn are stepped through, so every
+    level change shows. With cached frames (see set_cached()) the no-noise
+    tier is skipped, and asteroids under direct_min_radius keep full detail.
+    """
+
+    def __init__(self, target_ms=LOD_TARGET_FRAME_MS, smoothing=LOD_SMOOTHING, raise_ratio=LOD_RAISE_RATIO,
+                 lower_ratio=LOD_LOWER_RATIO, hold_frames=LOD_HOLD_FRAMES, enabled=LOD_ENABLED,
+                 cached=ASTEROID_SPRITE_CACHE, direct_min_radius=LOD_DIRECT_MIN_RADIUS):
+        self.target_ms = target_ms
+        self.smoothing = smoothing
+        self.raise_ratio = raise_ratio
+        self.lower_ratio = lower_ratio
+        self.hold_frames = hold_frames
+        self.enabled = enabled
+        self.direct_min_radius = direct_min_radius
+        self.level = 0
+        self.set_cached(cached)
+        self.average_ms = 0.0
+        self.frames_since_change = 0
+
+        # Statistics
+        self.raises = 0
+        self.lowers = 0
+
+    def set_cached(self, cached):
+        """Pick the tiers to step through for drawing with (True) or without cached frames"""
+        self.cached = cached
+        if cached:
+            # A cached frame blits at the same cost with or without noise, and a small one
+            # blits faster than its polygon draws, so small asteroids keep their frames
+            self.tiers = (LOD_FULL, LOD_FLAT, LOD_OUTLINE)
+            self.first_kind = max(1, math.ceil(self.direct_min_radius / ASTEROID_MIN_RADIUS))
+        else:
+            self.tiers = LOD_TIERS
+            self.first_kind = 1
+        # Enough levels for the biggest kind to reach the last tier
+        self.max_level = max(0, len(self.tiers) - 1 + ASTEROID_KINDS - self.first_kind)
+        self.level = min(self.level, self.max_level)
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.level = 0
+        self.frames_since_change = 0
+
+    def update(self, frame_ms):
+        """Feed the time the last frame spent working (excluding the frame-rate wait)"""
+        self.average_ms += (frame_ms - self.average_ms) * self.smoothing
+        self.frames_since_change += 1
+        if not self.enabled or self.frames_since_change < self.hold_frames:
+            return
+        # Separate thresholds for stepping up and down, so a frame time near the budget can't flip-flop
+        if self.average_ms > self.target_ms * self.raise_ratio and self.level < self.max_level:
+            self.level += 1
+            self.raises += 1
+            self.frames_since_change = 0
+        elif self.average_ms < self.target_ms * self.lower_ratio and self.level > 0:
+            self.level -= 1
+            self.lowers += 1
+            self.frames_since_change = 0
+
+    def tier(self, radius):
+        if self.level == 0:
+            return LOD_FULL
+        kind = max(1, round(radius / ASTEROID_MIN_RADIUS))
+        if kind < self.first_kind:
+            return LOD_FULL
+        step = self.level - (kind - self.first_kind)
+        return self.tiers[max(0, min(len(self.tiers) - 1, step))]
@@ -1,74 +1,109 @@
 import pygame
-import sys
+import os
+import time
+import random
+import argparse
+import rng
+import inputs
+import constants
 from constants import *
 from player import Player
 from asteroid import Asteroid
+from asteroidstore import AsteroidStore
 from asteroidfield import AsteroidField
 from shot import Shot
 from explosion import Explosion
+from collision import CollisionSystem
+from replay import Recorder
+from profiler import FrameProfiler, ProfilerOverlay
+from renderer import Renderer
+from stamps import StampBatch
+from world import WorldBounds, Camera
+from circleshape import CircleShape
+from entity import EntityRegistry, RegistryGroup
+from hud import Hud
+from assetcache import AssetCache
+from audio import VoiceManager
+from music import MusicPlayer
+from lod import LodController
 
 class Game:
-    def __init__(self):
-        pygame.init()
-        # Initialize sound system
-        if SOUND_ENABLED:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-            # Load and configure sounds
-            self.sounds = {
-                'standard_attack': self._load_sound(SOUND_STANDARD_ATTACK, ATTACK_SOUND_VOLUME),
-                'super_attack': self._load_sound(SOUND_SUPER_ATTACK, SUPER_ATTACK_SOUND_VOLUME),
-                'big_explosion': self._load_sound(SOUND_BIG_EXPLOSION, EXPLOSION_SOUND_VOLUME),
-                'medium_explosion': self._load_sound(SOUND_MEDIUM_EXPLOSION, EXPLOSION_SOUND_VOLUME),
-                'small_explosion': self._load_sound(SOUND_SMALL_EXPLOSION, EXPLOSION_SOUND_VOLUME),
-                'stunned': self._load_sound(SOUND_STUNNED, STUN_SOUND_VOLUME)
-            }
-            
-            # Initialize music system
-            self.current_theme = 1
-            pygame.mixer.music.set_volume(MUSIC_VOLUME)
-            pygame.mixer.music.load(MUSIC_THEME_1)
-            pygame.mixer.music.play(0)  # Play once, don't loop
-            
-            # Set up music end event handler
-            pygame.mixer.music.set_endevent(pygame.USEREVENT + 1)
-        
-        # Set up display
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF, 32)
-        pygame.display.set_caption("Asteroids!")
-        self.clock = pygame.time.Clock()
+    def __init__(self, headless=HEADLESS, seed=None):
+        self.headless = headless
+        self.sounds = {}
+        self.voices = None
+        self.music = None
 
-        # Load and scale background image
-        self.background_image = pygame.image.load(BACKGROUND_IMAGE_PATH).convert()
-        self.background_image = pygame.transform.scale(self.background_image, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        
-        # Create a persistent background surface
-        self.background_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.background_surface.blit(self.background_image, (0, 0))
+        # Resolve the screen size first, so it is timed as its own startup phase
+        self.screen_size = (constants.SCREEN_WIDTH, constants.SCREEN_HEIGHT)
+
+        # Seconds spent in each startup phase, printed by --startup-times
+        self.startup_times = [('resolution', constants.RESOLUTION_TIME)]
+        start = time.perf_counter()
+        self.assets = AssetCache()
+
+        self.seed = random.randrange(2**63) if seed is None else seed
+        self.recorder = None
 
-        # Set up font for score display
-        self.score_font = pygame.font.Font(None, SCORE_FONT_SIZE)
+        # Per-phase frame timings
+        self.profiler = FrameProfiler()
+        self.profiler_overlay = ProfilerOverlay(self.profiler)
+        self.profile_path = None
 
-        # Create groups
-        self.updatable = pygame.sprite.Group()
-        self.drawable = pygame.sprite.Group()
-        self.asteroids = pygame.sprite.Group()
-        self.shots = pygame.sprite.Group()
+        # Asteroid detail tiers, lowered while frames run over budget
+        self.lod = LodController()
+        Asteroid.lod = self.lod
 
-        # Assign groups to the Player class
-        Player.containers = (self.updatable, self.drawable)
-        Asteroid.containers = (self.asteroids, self.updatable, self.drawable)
-        AsteroidField.containers = (self.updatable)
-        Shot.containers = (self.shots, self.updatable, self.drawable)
-        Explosion.containers = (self.updatable, self.drawable)
+        if headless:
+            # No window and no audio: only the display module is needed for keyboard state
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            pygame.display.init()
+            self.screen = pygame.display.set_mode(self.screen_size)
+            # Nothing is drawn, so skip baking asteroid frames
+            Asteroid.use_sprite_cache = False
+            self.lod.set_cached(False)
+        else:
+            self._init_audio()
+            start = self._startup_phase('audio', start)
+            self._init_display()
+        start = self._startup_phase('display', start)
+
+        # The playfield every entity wraps and despawns in, and the screen-sized view of it
+        self.world = WorldBounds(WORLD_WIDTH or self.screen_size[0], WORLD_HEIGHT or self.screen_size[1])
+        self.camera = Camera(self.world, *self.screen_size)
+        CircleShape.world = self.world
+        CircleShape.camera = self.camera
+
+        # This game's asteroid kinematics; every asteroid it spawns, and their fragments, joins this store
+        self.asteroid_store = AsteroidStore()
+
+        # Every live entity of this game; whatever an entity spawns joins its registry
+        self.entities = EntityRegistry()
+
+        # Groups are views of the registry by type
+        self.updatable = RegistryGroup(self.entities, Player, AsteroidField, Shot, Explosion)
+        self.drawable = RegistryGroup(self.entities, Player, Asteroid)
+        self.asteroids = RegistryGroup(self.entities, Asteroid)  # Moved by the asteroid store, not updatable
+        self.shots = RegistryGroup(self.entities, Shot)  # Drawn in one batch by draw_world, not drawable
+        self.explosions = RegistryGroup(self.entities, Explosion)  # Likewise
 
         # Pass game instance to classes for sound access
         Shot.game = self
         Asteroid.game = self
         Player.game = self
 
+        # The pools are shared by every Game in the process; count this game's use only
+        for pool in (Shot.pool, Asteroid.pool, Explosion.pool):
+            pool.reset_stats()
+        if POOL_PREWARM:
+            self.prewarm_pools()
+
+        # Seed every gameplay random stream so a session can be replayed exactly
+        rng.seed(self.seed)
+
         # Create players with their initial positions and controls
-        player1_x = SCREEN_WIDTH // 4
-        player1_y = SCREEN_HEIGHT // 2
+        player1_x = self.world.width // 4
+        player1_y = self.world.height // 2
         player1_controls = {
             'left': PLAYER1_LEFT,
             'right': PLAYER1_RIGHT,
@@ -77,10 +112,10 @@ class Game:
             'shoot': PLAYER1_SHOOT,
             'super': PLAYER1_SUPER
         }
-        self.player1 = Player(player1_x, player1_y, player1_controls, color=(0, 255, 0))  # Green
+        self.player1 = self.entities.add(Player(player1_x, player1_y, player1_controls, color=(0, 255, 0)))  # Green
 
-        player2_x = 3 * SCREEN_WIDTH // 4
-        player2_y = SCREEN_HEIGHT // 2
+        player2_x = 3 * self.world.width // 4
+        player2_y = self.world.height // 2
         player2_controls = {
             'left': PLAYER2_LEFT,
             'right': PLAYER2_RIGHT,
@@ -89,17 +124,89 @@ class Game:
             'shoot': PLAYER2_SHOOT,
             'super': PLAYER2_SUPER
         }
-        self.player2 = Player(player2_x, player2_y, player2_controls, color=(207, 159, 255))  # Light blue
+        self.player2 = self.entities.add(Player(player2_x, player2_y, player2_controls, color=(207, 159, 255)))  # Light blue
 
         # Create an asteroid field instance
-        self.asteroid_field = AsteroidField()
+        self.asteroid_field = self.entities.add(AsteroidField(self.world, self.asteroid_store))
+
+        # Broadphase collision detection
+        self.collisions = CollisionSystem(self.world.width, self.world.height)
+
+        # Shots and particles go out in one blits call per frame, skipping any off screen
+        self.stamps = StampBatch((0, 0, *self.screen_size))
+
+        # Scores and player status, re-rendered only when they change
+        if not headless:
+            self.hud = Hud(self.player1, self.player2, self.screen_size[0])
 
         # Initialize delta time variable
         self.dt = 0
+        self._startup_phase('world', start)
+
+    def _startup_phase(self, name, start):
+        now = time.perf_counter()
+        self.startup_times.append((name, now - start))
+        return now
+
+    def prewarm_pools(self):
+        """Fill the entity pools before play so the first busy frames don't allocate"""
+        use_sprite_cache = Asteroid.use_sprite_cache
+        Asteroid.use_sprite_cache = False  # Don't bake frames for throwaway shapes
+        Shot.pool.prewarm(SHOT_POOL_PREWARM, 0, 0, pygame.Vector2(0, 0))
+        Asteroid.pool.prewarm(ASTEROID_POOL_PREWARM, 0, 0, ASTEROID_MIN_RADIUS, self.asteroid_store)
+        Explosion.pool.prewarm(EXPLOSION_POOL_PREWARM, 0, 0)
+        Asteroid.use_sprite_cache = use_sprite_cache
+
+    def pool_stats(self):
+        return {
+            'shots': Shot.pool.stats(),
+            'asteroids': Asteroid.pool.stats(),
+            'explosions': Explosion.pool.stats(),
+        }
+
+    def _init_audio(self):
+        # Initialize sound system
+        if SOUND_ENABLED:
+            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            # Load and configure sounds
+            self.sounds = {
+                'standard_attack': self._load_sound(SOUND_STANDARD_ATTACK, ATTACK_SOUND_VOLUME),
+                'super_attack': self._load_sound(SOUND_SUPER_ATTACK, SUPER_ATTACK_SOUND_VOLUME),
+                'big_explosion': self._load_sound(SOUND_BIG_EXPLOSION, EXPLOSION_SOUND_VOLUME),
+                'medium_explosion': self._load_sound(SOUND_MEDIUM_EXPLOSION, EXPLOSION_SOUND_VOLUME),
+                'small_explosion': self._load_sound(SOUND_SMALL_EXPLOSION, EXPLOSION_SOUND_VOLUME),
+                'stunned': self._load_sound(SOUND_STUNNED, STUN_SOUND_VOLUME)
+            }
+            # Throttles bursts (a super attack splitting a cluster) so the mixer never runs out of channels
+            self.voices = VoiceManager(self.sounds)
+            
+            # Alternate between the themes, decoding the next one in the background
+            self.music = MusicPlayer([MUSIC_THEME_1, MUSIC_THEME_2])
+            self.music.start()
+
+    def _init_display(self):
+        # Only the modules the game uses; the display is already up from resolving the screen size
+        pygame.display.init()
+        pygame.font.init()
+
+        # Set up display
+        self.screen = pygame.display.set_mode(self.screen_size, pygame.FULLSCREEN | pygame.HWSURFACE | pygame.DOUBLEBUF, 32)
+        pygame.display.set_caption("Asteroids!")
+        self.clock = pygame.time.Clock()
+
+        # Load and scale background image (or map the scaled copy from a previous launch)
+        self.background_image = self.assets.background(BACKGROUND_IMAGE_PATH, self.screen_size)
+        
+        # Create a persistent background surface
+        self.background_surface = pygame.Surface(self.screen_size)
+        self.background_surface.blit(self.background_image, (0, 0))
+
+        # Full-flip or dirty-rect presentation
+        self.renderer = Renderer(self.screen, self.background_surface)
 
     def _load_sound(self, path, volume):
         try:
-            sound = pygame.mixer.Sound(path)
+            sound = self.assets.sound(path)
             sound.set_volume(volume * SOUND_VOLUME)
             return sound
         except:
@@ -111,6 +218,12 @@ class Game:
             return self.sounds[name]
         return None
 
+    def play_sound(self, name):
+        """Play a sound effect through the voice manager (a no-op without audio)"""
+        if self.voices:
+            return self.voices.play(name)
+        return None
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -118,71 +231,212 @@ class Game:
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:  # ESC key to exit
                     return False
-            elif event.type == pygame.USEREVENT + 1:  # Music ended event
-                # Switch to the other theme
-                self.current_theme = 2 if self.current_theme == 1 else 1
-                next_theme = MUSIC_THEME_1 if self.current_theme == 1 else MUSIC_THEME_2
-                try:
-                    pygame.mixer.music.load(next_theme)
-                    pygame.mixer.music.play(0)  # Play once, don't loop
-                except pygame.error as e:
-                    print(f"Error loading music theme: {e}")
+                elif event.key == pygame.K_F2:  # Toggle cached asteroid frames for visual comparison
+                    Asteroid.use_sprite_cache = not Asteroid.use_sprite_cache
+                    self.lod.set_cached(Asteroid.use_sprite_cache)
+                elif event.key == pygame.K_F3:  # Toggle the profiler overlay
+                    self.profiler_overlay.toggle()
+                elif event.key == pygame.K_F4:  # Toggle dirty-rect rendering
+                    self.renderer.toggle()
+                elif event.key == pygame.K_F5:  # Toggle adaptive asteroid detail
+                    self.lod.toggle()
         return True
 
+    def read_input(self):
+        """Pack both players' pressed controls into one input mask"""
+        pressed = pygame.key.get_pressed()
+        return inputs.combine(inputs.encode(pressed, self.player1.controls),
+                              inputs.encode(pressed, self.player2.controls))
+
+    def step(self, dt, input_mask=0):
+        """Advance the simulation by dt seconds: all updates plus both collision passes"""
+        if self.recorder:
+            self.recorder.record(dt, input_mask)
+        self.player1.control_mask = inputs.player_mask(input_mask, 0)
+        self.player2.control_mask = inputs.player_mask(input_mask, 1)
+
+        # Remember where the ships and shots start this step, so frames can be drawn between steps
+        for obj in (self.player1, self.player2, *self.shots):
+            obj.prev_position.update(obj.position)
+
+        # Move and spin every asteroid in one batch, before anything this step can spawn more
+        self.asteroid_store.update(dt, self.world)
+
+        # Update all objects in the updatable group
+        for obj in self.updatable:
+            obj.update(dt)
+        self.profiler.lap('update')
+        
+        # Check collisions between players and asteroids
+        players = (self.player1, self.player2)
+        for player, asteroid in self.collisions.player_hits(players, self.asteroids):
+            player.stun(asteroid.position)
+        self.profiler.lap('player_collisions')
+        
+        # Check collisions between bullets and asteroids
+        for shot, asteroid in self.collisions.shot_hits(self.shots, self.asteroids):
+            # Award points to the shot's owner
+            if shot.owner:
+                shot.owner.add_score(SCORE_POINTS)
+            asteroid.split()  # Remove the asteroid
+            shot.kill()  # Remove the shot
+        self.profiler.lap('shot_collisions')
+
+        # Everything killed this step can be reused from the next one
+        Shot.pool.collect()
+        Asteroid.pool.collect()
+        Explosion.pool.collect()
+
+    def draw(self):
+        # Start with a fresh screen (or freshly restored dirty rects) from our pre-rendered background
+        self.renderer.begin()
+
+        # Keep both ships in view (a no-op unless the world is bigger than the screen)
+        self.camera.follow((self.player1.render_position(), self.player2.render_position()))
+
+        # Draw the drawables, then the batched shots and particles
+        for rect in self.draw_world(self.screen):
+            self.renderer.add(rect)
+        self.profiler.lap('draw')
+
+        # Draw scores and player status
+        for rect in self.hud.draw(self.screen):
+            self.renderer.add(rect)
+        self.profiler.lap('hud')
+
+        counts = {**self.entity_counts(), 'asteroid_mass': self.asteroid_field.mass(), 'lod_level': self.lod.level}
+        self.renderer.add(self.profiler_overlay.draw(self.screen, self.dt, counts))
+        self.profiler.lap('overlay')
+
+        # Update the display
+        self.renderer.present()
+        self.profiler.lap('flip')
+
+    def draw_world(self, screen):
+        """Draw every drawable onto screen and return the rects touched.
+
+        Everything is drawn relative to the camera, and asteroids off screen
+        are skipped. Shots and explosion particles are collected into one
+        StampBatch and blitted together after everything else, so they
+        appear on top.
+        """
+        rects = [obj.draw(screen) for obj in self.drawable]
+        self.stamps.offset = self.camera.offset
+        self.stamps.add_circles(self.shots)
+        for explosion in self.explosions:
+            explosion.submit(self.stamps)
+        rects.extend(self.stamps.flush(screen))
+        return rects
+
     def run(self):
         running = True
+        step_dt = 1 / SIMULATION_HZ
+        accumulator = 0.0  # Elapsed time not yet simulated
         # Game Loop
         while running:
+            self.profiler.begin_frame()
+
             # Event handling
             running = self.handle_events()
+            self.profiler.lap('events')
 
-            # Start with a fresh screen using our pre-rendered background
-            self.screen.blit(self.background_surface, (0, 0))
+            if FIXED_TIMESTEP:
+                # Run as many fixed steps as the elapsed time covers, then draw the remainder as a blend
+                accumulator += self.dt
+                input_mask = self.read_input()
+                steps = 0
+                while accumulator >= step_dt and steps < MAX_CATCH_UP_STEPS:
+                    self.step(step_dt, input_mask)
+                    accumulator -= step_dt
+                    steps += 1
+                if accumulator >= step_dt:
+                    # Too far behind (a stall or a breakpoint): drop the backlog rather than fast-forward
+                    accumulator %= step_dt
+                CircleShape.render_alpha = accumulator / step_dt
+            else:
+                self.step(self.dt, self.read_input())
+            self.draw()
 
-            # Update all objects in the updatable group
-            for obj in self.updatable:
-                obj.update(self.dt)
-            
-            # Check collisions between players and asteroids
-            for asteroid in self.asteroids:
-                # Check player 1 collision
-                if self.player1.check_collision(asteroid):
-                    self.player1.stun(asteroid.position)
-                # Check player 2 collision
-                if self.player2.check_collision(asteroid):
-                    self.player2.stun(asteroid.position)
-            
-            # Check collisions between bullets and asteroids
-            for asteroid in self.asteroids:
-                for shot in self.shots:
-                    if shot.check_collision(asteroid):  # If bullet hits asteroid
-                        # Award points to the shot's owner
-                        if shot.owner:
-                            shot.owner.add_score(SCORE_POINTS)
-                        asteroid.split()  # Remove the asteroid
-                        shot.kill()  # Remove the shot
-
-            # Draw all objects in the drawable group
-            for obj in self.drawable:
-                obj.draw(self.screen)
-
-            # Draw scores
-            # Player 1 score (left side)
-            score_text1 = self.score_font.render(str(self.player1.score), True, self.player1.color)
-            self.screen.blit(score_text1, (SCORE_PADDING, SCORE_PADDING))
-
-            # Player 2 score (right side)
-            score_text2 = self.score_font.render(str(self.player2.score), True, self.player2.color)
-            score_rect2 = score_text2.get_rect()
-            self.screen.blit(score_text2, (SCREEN_WIDTH - score_rect2.width - SCORE_PADDING, SCORE_PADDING))
-
-            # Update the display
-            pygame.display.flip()
-
-            # Cap the frame rate at 60 FPS and get delta time
-            framerate = 60
-            self.dt = self.clock.tick(framerate) / 1000  # Convert milliseconds to seconds
+            # Pick asteroid detail from this frame's work time, before the frame-rate wait
+            self.lod.update((time.perf_counter_ns() - self.profiler.frame_start) / 1e6)
+            if not self.recorder:
+                # Spawns held back by wall-clock frame time would not replay the same
+                self.asteroid_field.frame_ms = self.lod.average_ms
+
+            # Cap the frame rate (RENDER_FPS 0 leaves it unlocked) and get delta time
+            self.dt = self.clock.tick(RENDER_FPS) / 1000  # Convert milliseconds to seconds
+            if self.voices:
+                self.voices.update(self.dt)
+            if self.music:
+                self.music.update(self.dt)
+            self.profiler.lap('wait')
+            self.profiler.end_frame(self.entity_counts())
+
+        if self.music:
+            self.music.stop()
+        if self.recorder:
+            self.recorder.close()
+        if self.profile_path:
+            self.profiler.export(self.profile_path)
+
+    def record(self, path):
+        """Record every following step's dt and input to a replay file"""
+        self.recorder = Recorder(path, self.seed, self.world.width, self.world.height)
+
+    def simulate(self, seconds, dt=SIMULATION_DT):
+        """Step the simulation for the given number of seconds as fast as possible, without drawing"""
+        steps = int(round(seconds / dt))
+        start = time.perf_counter()
+        for _ in range(steps):
+            self.profiler.begin_frame()
+            self.step(dt)
+            self.profiler.end_frame()
+        return self._result(steps, steps * dt, time.perf_counter() - start)
+
+    def play_replay(self, replay):
+        """Drive the simulation from a recorded replay as fast as possible, without drawing"""
+        start = time.perf_counter()
+        for dt, input_mask in replay.frames:
+            self.profiler.begin_frame()
+            self.step(dt, input_mask)
+            self.profiler.end_frame()
+        return self._result(len(replay.frames), replay.seconds, time.perf_counter() - start)
+
+    def _result(self, steps, seconds, elapsed):
+        return {
+            'seconds': seconds,
+            'steps': steps,
+            'wall_time': elapsed,
+            'steps_per_second': steps / elapsed if elapsed > 0 else float('inf'),
+            'scores': (self.player1.score, self.player2.score),
+            'counts': self.entity_counts(),
+            'pools': self.pool_stats(),
+            'field': self.asteroid_field.stats(),
+        }
+
+    def entity_counts(self):
+        return {
+            'asteroids': len(self.asteroids),
+            'shots': len(self.shots),
+            'explosions': len(self.explosions),
+            'exhaust_particles': len(self.player1.exhaust) + len(self.player2.exhaust),
+        }
 
 if __name__ == "__main__":
-    game = Game()
+    parser = argparse.ArgumentParser(description="Asteroids for Two")
+    parser.add_argument("--seed", type=int, help="seed for all gameplay randomness")
+    parser.add_argument("--record", metavar="PATH", help="record this session to a replay file")
+    parser.add_argument("--profile-out", metavar="PATH", help="write frame timings to a .csv or .json file at exit")
+    parser.add_argument("--startup-times", action="store_true", help="print how long each startup phase took")
+    args = parser.parse_args()
+
+    game = Game(seed=args.seed)
+    if args.startup_times:
+        for phase, seconds in game.startup_times:
+            print(f"  {phase}: {seconds * 1000:.1f} ms")
+        print(f"Startup: {sum(seconds for _, seconds in game.startup_times) * 1000:.1f} ms "
+              f"(asset cache: {game.assets.hits} hits, {game.assets.misses} misses)")
+    if args.record:
+        game.record(args.record)
+    game.profile_path = args.profile_out
     game.run()
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from constants import MUSIC_VOLUME, MUSIC_CROSSFADE, MUSIC_PREFETCH_LEAD, SOUND_CHANNELS
+
+class MusicPlayer:
+    """Plays a looping playlist on two reserved mixer channels, crossfading between tracks.
+
+    Each track is decoded into a Sound on a worker thread while the previous
+    one plays, so any format the mixer can load (WAV, OGG, MP3, FLAC) works
+    and the main loop never waits on a load. update() only polls; tracks
+    that cannot be loaded are skipped without a word, and the player goes
+    quiet if none can.
+
+    Nothing is streamed: a track is held whole as raw samples, about 10 MB
+    per minute of 44.1 kHz 16-bit stereo. The next track only starts
+    decoding prefetch_lead seconds before the current one ends, so two
+    tracks are in memory together just around each crossfade.
+    """
+
+    def __init__(self, tracks, first_channel=SOUND_CHANNELS, volume=MUSIC_VOLUME, crossfade=MUSIC_CROSSFADE,
+                 prefetch_lead=MUSIC_PREFETCH_LEAD):
+        self.tracks = list(tracks)
+        self.volume = volume
+        self.crossfade = crossfade
+        self.prefetch_lead = max(prefetch_lead, crossfade)
+        if pygame.mixer.get_num_channels() < first_channel + 2:
+            pygame.mixer.set_num_channels(first_channel + 2)
+        self.channels = (pygame.mixer.Channel(first_channel), pygame.mixer.Channel(first_channel + 1))
+        self.worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="music")
+
+        self.next_index = 0
+        self.pending = None  # Future of (track index, Sound or None)
+        self.ready = None  # Decoded next track, waiting for its turn
+        self.channel = None  # Channel of the track playing now
+        self.remaining = 0.0  # Seconds left of the track playing now
+        self.failed = set()  # Indices of tracks that could not be loaded
+
+    def start(self):
+        self._prefetch()
+
+    def stop(self):
+        for channel in self.channels:
+            channel.stop()
+        self.worker.shutdown(wait=False, cancel_futures=True)
+        self.pending = None
+
+    def update(self, dt):
+        if self.channel is not None:
+            self.remaining -= dt
+
+        if self.pending is not None and self.pending.done():
+            index, sound = self.pending.result()
+            self.pending = None
+            if sound is None:
+                self.failed.add(index)
+            else:
+                self.failed.discard(index)
+                self.ready = sound
+
+        if self.ready is None:
+            if self.channel is None or self.remaining <= self.prefetch_lead:
+                self._prefetch()
+        else:
+            finished = self.channel is None or not self.channel.get_busy()
+            if finished or self.remaining <= self.crossfade:
+                self._switch(fade=not finished)
+
+    def _switch(self, fade):
+        fade_ms = int(self.crossfade * 1000) if fade else 0
+        channel = self.channels[1] if self.channel is self.channels[0] else self.channels[0]
+        if fade:
+            self.channel.fadeout(fade_ms)
+        channel.play(self.ready, fade_ms=fade_ms)
+        channel.set_volume(self.volume)
+        self.channel = channel
+        self.remaining = self.ready.get_length()
+        self.ready = None
+
+    def _prefetch(self):
+        if self.pending is not None or len(self.failed) >= len(self.tracks):
+            return
+        index = self.next_index
+        self.next_index = (index + 1) % len(self.tracks)
+        self.pending = self.worker.submit(self._load, index)
+
+    def _load(self, index):
+        # Runs on the worker thread
+        try:
+            return index, pygame.mixer.Sound(self.tracks[index])
+        except (pygame.error, OSError):
+            return index, None
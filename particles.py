@@ -0,0 +1,142 @@
+import numpy as np
+import pygame
+from stamps import get_stamp
+
+PARTICLE_ALPHA_STEP = 8  # Alpha is quantized to this step so faded stamps can be reused
+
+class ParticleBuffer:
+    """Struct-of-arrays particle storage updated in one batched step.
+
+    Live particles always occupy the first `count` slots. Dead particles are
+    removed by compacting the survivors to the front in place, and the arrays
+    only grow (by doubling) when an emit does not fit.
+    """
+
+    def __init__(self, capacity=16):
+        self.count = 0
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.lifetime = np.zeros(capacity)
+        self.max_lifetime = np.ones(capacity)
+        self.initial_size = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.alpha = np.zeros(capacity, dtype=np.int32)
+        self.shrink = np.zeros(capacity, dtype=bool)  # Shrink with remaining lifetime
+        self.quick_fade = np.zeros(capacity, dtype=bool)  # Burn lifetime faster and at half alpha
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def reserve(self, capacity):
+        """Make room for at least capacity particles without emitting any"""
+        if capacity > len(self.lifetime):
+            self._grow(capacity)
+
+    def emit(self, positions, velocities, lifetime, size, color, shrink=False):
+        """Append a batch of particles; positions and velocities are (n, 2) arrays"""
+        n = len(positions)
+        start, end = self.count, self.count + n
+        self.reserve(end)
+        self.position[start:end] = positions
+        self.velocity[start:end] = velocities
+        self.lifetime[start:end] = lifetime
+        self.max_lifetime[start:end] = lifetime
+        self.initial_size[start:end] = size
+        self.size[start:end] = size
+        self.color[start:end] = color[:3]
+        self.alpha[start:end] = 255
+        self.shrink[start:end] = shrink
+        self.quick_fade[start:end] = False
+        self.count = end
+
+    def step(self, dt, quick_fade_multiplier=6.0):
+        n = self.count
+        if n == 0:
+            return
+
+        # Age particles, quick-fading ones much faster
+        lifetime = self.lifetime[:n]
+        lifetime -= np.where(self.quick_fade[:n], dt * quick_fade_multiplier, dt)
+        alive = lifetime > 0
+        if not alive.all():
+            self._compact(alive)
+            n = self.count
+            if n == 0:
+                return
+
+        # Move, shrink and fade the survivors
+        self.position[:n] += self.velocity[:n] * dt
+        life_fraction = self.lifetime[:n] / self.max_lifetime[:n]
+        self.size[:n] = np.where(self.shrink[:n], self.initial_size[:n] * life_fraction, self.initial_size[:n])
+        alpha = (255 * life_fraction).astype(np.int32)
+        self.alpha[:n] = np.where(self.quick_fade[:n], (alpha * 0.5).astype(np.int32), alpha)
+
+    def draw(self, screen, offset=(0, 0)):
+        """Blit every visible particle, offset subtracted, and return the bounding rect of what was drawn"""
+        blit_list, bounds, _ = self.stamps(offset=offset)
+        if not blit_list:
+            return None
+        screen.blits(blit_list, doreturn=False)
+        return bounds
+
+    def submit(self, batch):
+        """Add every visible particle inside the batch's viewport to a StampBatch"""
+        batch.add_many(*self.stamps(batch.viewport, batch.offset))
+
+    def stamps(self, viewport=None, offset=(0, 0)):
+        """Return the (stamp, (x, y)) blits of the visible particles, their bounding rect and how many were culled"""
+        n = self.count
+        if n == 0:
+            return [], None, 0
+        visible = np.flatnonzero(self.size[:n] >= 1)
+
+        # Stamp surfaces are (2 * size) squares, matching the old per-particle surfaces
+        sizes = self.size[visible]
+        diameters = np.maximum(1, (sizes * 2).astype(np.int32))
+        xs = (self.position[visible, 0] - offset[0] - diameters // 2).astype(np.int32)
+        ys = (self.position[visible, 1] - offset[1] - diameters // 2).astype(np.int32)
+        culled = 0
+        if viewport is not None:
+            inside = ((xs + diameters > viewport.left) & (xs < viewport.right) &
+                      (ys + diameters > viewport.top) & (ys < viewport.bottom))
+            culled = len(visible) - int(np.count_nonzero(inside))
+            if culled:
+                visible, sizes, diameters, xs, ys = (a[inside] for a in (visible, sizes, diameters, xs, ys))
+        if len(visible) == 0:
+            return [], None, culled
+
+        radii = np.maximum(1, sizes).astype(np.int32)
+        alphas = self.alpha[visible] // PARTICLE_ALPHA_STEP * PARTICLE_ALPHA_STEP
+        colors = self.color[visible]
+        blit_list = []
+        for i in range(len(visible)):
+            color = colors[i]
+            stamp = get_stamp(int(color[0]), int(color[1]), int(color[2]), int(alphas[i]),
+                              int(diameters[i]), int(radii[i]))
+            blit_list.append((stamp, (int(xs[i]), int(ys[i]))))
+
+        left, top = int(xs.min()), int(ys.min())
+        right, bottom = int((xs + diameters).max()), int((ys + diameters).max())
+        return blit_list, pygame.Rect(left, top, right - left, bottom - top), culled
+
+    def _compact(self, alive):
+        keep = np.flatnonzero(alive)
+        k = len(keep)
+        for array in (self.position, self.velocity, self.lifetime, self.max_lifetime,
+                      self.initial_size, self.size, self.color, self.alpha,
+                      self.shrink, self.quick_fade):
+            array[:k] = array[keep]
+        self.count = k
+
+    def _grow(self, needed):
+        capacity = max(needed, len(self.lifetime) * 2)
+        for name in ('position', 'velocity', 'lifetime', 'max_lifetime', 'initial_size',
+                     'size', 'color', 'alpha', 'shrink', 'quick_fade'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
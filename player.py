@@ -3,11 +3,11 @@ from shot import Shot
 from constants import *
 from exhaust import ExhaustSystem
 from explosion import Explosion
+import inputs
 import pygame
 import math
 
 class Player(CircleShape):
-    containers = None
     game = None  # Will hold reference to game instance for sound access
 
     def __init__(self, x, y, controls=None, color="white"):
@@ -39,37 +39,35 @@ class Player(CircleShape):
             }
         else:
             self.controls = controls
+        self.control_mask = None  # Set by the game each step; None reads the keyboard directly
 
         # Stun mechanics
         self.stun_timer = 0
         self.is_stunned = False
         self.knockback_velocity = pygame.Vector2(0, 0)
 
-        # Add this instance to the assigned groups
-        if Player.containers:
-            for group in Player.containers:
-                group.add(self)
-
     # function to define the player rocket shape
-    def triangle(self):
+    def triangle(self, position=None):
+        if position is None:
+            position = self.position
         # Calculate base vectors
         forward = pygame.Vector2(0, 1).rotate(self.rotation)
         right = pygame.Vector2(0, 1).rotate(self.rotation + 90)
         
         # Calculate key points
         # Nose of the rocket (front point)
-        nose = self.position + forward * self.radius
+        nose = position + forward * self.radius
         
         # Base points (wider than before)
         base_width = self.radius * 0.8  # Slightly narrower than before
-        base_right = self.position - forward * (self.radius * 0.8) + right * base_width
-        base_left = self.position - forward * (self.radius * 0.8) - right * base_width
+        base_right = position - forward * (self.radius * 0.8) + right * base_width
+        base_left = position - forward * (self.radius * 0.8) - right * base_width
         
         # Engine nozzle points (creates a small indent for the engine)
         nozzle_width = base_width * 0.4  # Engine is 40% of base width
         nozzle_back = self.radius * 0.9  # Slightly forward of the base
-        nozzle_right = self.position - forward * nozzle_back + right * nozzle_width
-        nozzle_left = self.position - forward * nozzle_back - right * nozzle_width
+        nozzle_right = position - forward * nozzle_back + right * nozzle_width
+        nozzle_left = position - forward * nozzle_back - right * nozzle_width
         
         # Return points in drawing order
         return [
@@ -83,10 +81,12 @@ class Player(CircleShape):
     # function to draw the player rocket
     def draw(self, screen):
         # Draw exhaust first so it appears behind the ship
-        self.exhaust.draw(screen)
+        camera = Player.camera
+        exhaust_rect = self.exhaust.draw(screen, camera.offset if camera else (0, 0))
 
-        # Get the points for the rocket shape
-        points = self.triangle()
+        # Get the points for the rocket shape, where it is on screen between the last two steps
+        position = self.screen_position()
+        points = self.triangle(position)
         
         # Convert string color names to RGB tuples if needed
         if isinstance(self.color, str):
@@ -117,7 +117,7 @@ class Player(CircleShape):
         pygame.draw.polygon(screen, fill_color, points, 0)
         
         # Draw outline
-        pygame.draw.polygon(screen, outline_color, points, 2)
+        rect = pygame.draw.polygon(screen, outline_color, points, 2)
         
         # Only draw detail line when not stunned
         if not self.is_stunned:
@@ -126,9 +126,21 @@ class Player(CircleShape):
             right = pygame.Vector2(0, 1).rotate(self.rotation + 90)
             detail_back = self.radius * 0.3  # Position of detail line
             detail_width = self.radius * 0.4  # Width of detail line
-            detail_start = self.position + forward * (self.radius - detail_back) - right * detail_width
-            detail_end = self.position + forward * (self.radius - detail_back) + right * detail_width
-            pygame.draw.line(screen, outline_color, detail_start, detail_end, 1)
+            detail_start = position + forward * (self.radius - detail_back) - right * detail_width
+            detail_end = position + forward * (self.radius - detail_back) + right * detail_width
+            # The detail line is wider than the hull near the nose, so it extends the dirty rect
+            rect.union_ip(pygame.draw.line(screen, outline_color, detail_start, detail_end, 1))
+
+        # Report everything we touched for dirty-rect rendering
+        if exhaust_rect:
+            rect.union_ip(exhaust_rect)
+        return rect
+
+    def read_controls(self):
+        """Return a dict of control name -> pressed for this step"""
+        if self.control_mask is None:
+            return inputs.decode(inputs.encode(pygame.key.get_pressed(), self.controls))
+        return inputs.decode(self.control_mask)
 
     # function to rotate the player rocket
     def rotate(self, dt, direction):
@@ -158,21 +170,21 @@ class Player(CircleShape):
         self.is_moving = False
         self.move_direction = 1
         
-        # Get current keyboard state
-        keys = pygame.key.get_pressed()
+        # Get current control state
+        keys = self.read_controls()
 
         # Handle rotation (independent of movement)
-        if keys[self.controls['left']]:
+        if keys['left']:
             self.rotate(dt, -1)
-        if keys[self.controls['right']]:
+        if keys['right']:
             self.rotate(dt, 1)
 
         # Handle movement
-        if keys[self.controls['forward']]:
+        if keys['forward']:
             self.is_moving = True
             self.move_direction = 1
             self.move(dt)
-        if keys[self.controls['backward']]:
+        if keys['backward']:
             self.is_moving = True
             self.move_direction = -1
             self.move(dt, -1)
@@ -193,17 +205,17 @@ class Player(CircleShape):
             self.super_timer -= dt
 
         # Handle shooting
-        if keys[self.controls['shoot']] and self.shoot_timer <= 0:
+        if keys['shoot'] and self.shoot_timer <= 0:
             self.shoot()
             
         # Handle super attack
-        if keys[self.controls['super']] and self.super_timer <= 0:
+        if keys['super'] and self.super_timer <= 0:
             self.super_attack()
             
         # Update exhaust system - use velocity for intensity
         speed = self.velocity.length() / MAX_SPEED  # Normalize speed to 0-1
         # Determine if we're braking
-        is_braking = keys[self.controls['backward']] and self.velocity.length() > 0
+        is_braking = keys['backward'] and self.velocity.length() > 0
         if is_braking:
             # Show exhaust in opposite direction when braking
             brake_rotation = (self.rotation + 180) % 360
@@ -228,21 +240,14 @@ class Player(CircleShape):
                 shot_velocity = pygame.Vector2(0, 1).rotate(angle) * SUPER_ATTACK_SPEED
                 
                 # Create the shot with a different color for super attacks
-                shot = Shot(self.position.x, self.position.y, shot_velocity, owner=self)
-                
-                # Add the shot to the appropriate groups
-                if Shot.containers:
-                    for group in Shot.containers:
-                        group.add(shot)
+                shot = self.registry.add(Shot.spawn(self.position.x, self.position.y, shot_velocity, owner=self))
             
             # Play super attack sound if available
             if hasattr(Shot, 'game') and Shot.game:
-                sound = Shot.game.get_sound('super_attack')
-                if sound:
-                    sound.play()
+                Shot.game.play_sound('super_attack')
             
             # Create a visual effect for the super attack
-            flash = Explosion(self.position.x, self.position.y, self.color)
+            flash = self.registry.add(Explosion.spawn(self.position.x, self.position.y, self.color))
         else:
             print(f"Super attack on cooldown: {self.super_timer:.1f} seconds")  # Debug print
 
@@ -291,13 +296,11 @@ class Player(CircleShape):
         shot_velocity = forward * PLAYER_SHOOT_SPEED
         
         # Create the shot
-        shot = Shot(self.position.x, self.position.y, shot_velocity, owner=self)
+        shot = self.registry.add(Shot.spawn(self.position.x, self.position.y, shot_velocity, owner=self))
         
         # Play shooting sound if available
         if hasattr(Shot, 'game') and Shot.game:
-            sound = Shot.game.get_sound('standard_attack')
-            if sound:
-                sound.play()
+            Shot.game.play_sound('standard_attack')
                 
     def stun(self, asteroid_pos):
         if not self.is_stunned:
@@ -313,20 +316,7 @@ class Player(CircleShape):
             
             # Play stun sound if available
             if hasattr(Player, 'game') and Player.game:
-                sound = Player.game.get_sound('stunned')
-                if sound:
-                    sound.play()
-
-    def wrap_position(self):
-        # Wrap position around the screen edges
-        if self.position.x < 0:
-            self.position.x = SCREEN_WIDTH
-        elif self.position.x > SCREEN_WIDTH:
-            self.position.x = 0
-        if self.position.y < 0:
-            self.position.y = SCREEN_HEIGHT
-        elif self.position.y > SCREEN_HEIGHT:
-            self.position.y = 0
+                Player.game.play_sound('stunned')
 
     def add_score(self, points):
         """Add points to the player's score"""
@@ -0,0 +1,85 @@
+class Pool:
+    """Free list of reusable game objects of one class.
+
+    Released objects are parked until collect() is called (once per step),
+    so nothing killed during a step is handed out again before that step's
+    loops are done with it.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.free = []
+        self.pending = []  # Released this step, reusable after collect()
+        self.active = set()  # Handed out by acquire() and not released since
+        self.reset_stats()
+
+    @property
+    def in_use(self):
+        return len(self.active)
+
+    def reset_stats(self):
+        """Start counting afresh, e.g. for a new game sharing the class's pool"""
+        self.high_water = self.in_use
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+            self.reused += 1
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        self.active.add(obj)
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj):
+        if obj not in self.active:
+            return  # Killed twice, or built directly rather than acquired
+        self.active.remove(obj)
+        self.pending.append(obj)
+
+    def collect(self):
+        """Make everything released since the last call available for reuse"""
+        self.free.extend(self.pending)
+        self.pending.clear()
+
+    def prewarm(self, count, *args, **kwargs):
+        """Create objects up front so the first busy frames don't have to"""
+        for _ in range(count):
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+            self.active.add(obj)
+            obj.kill()
+        self.collect()
+
+    def stats(self):
+        return {
+            'size': len(self.free) + len(self.pending),
+            'in_use': self.in_use,
+            'high_water': self.high_water,
+            'created': self.created,
+            'reused': self.reused,
+        }
+
+class Pooled:
+    """Mixin for entities whose kill() returns them to their class's pool.
+
+    Subclasses must implement reset() with the same arguments as __init__,
+    reinitializing the object in place.
+    """
+    __slots__ = ()  # Adds no per-instance fields, so slotted entities stay slotted
+    pool = None
+
+    @classmethod
+    def spawn(cls, *args, **kwargs):
+        """Create an instance, reusing a pooled one when available"""
+        return cls.pool.acquire(*args, **kwargs)
+
+    def kill(self):
+        super().kill()
+        if self.pool:
+            self.pool.release(self)
\ No newline at end of file
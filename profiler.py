@@ -0,0 +1,157 @@
+import csv
+import json
+import time
+import pygame
+from array import array
+from constants import PROFILER_WINDOW, PROFILER_FONT_SIZE, PROFILER_OVERLAY_REFRESH
+
+class RingBuffer:
+    """Fixed-size buffer of the most recent integer samples"""
+
+    def __init__(self, size):
+        self.samples = array('q', bytes(8 * size))
+        self.size = size
+        self.index = 0
+        self.count = 0
+
+    def push(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def values(self):
+        """Samples from oldest to newest"""
+        if self.count < self.size:
+            return self.samples[:self.count].tolist()
+        return self.samples[self.index:].tolist() + self.samples[:self.index].tolist()
+
+    def percentiles(self, *points):
+        ordered = sorted(self.values())
+        if not ordered:
+            return [0] * len(points)
+        return [ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] for p in points]
+
+class FrameProfiler:
+    """Times each phase of a frame with perf_counter_ns and keeps rolling statistics.
+
+    Call begin_frame() at the top of the frame, lap(name) after each phase
+    and end_frame() at the bottom. Every phase seen so far gets one sample per
+    frame (zero if it did not run), so exported rows line up by frame.
+    """
+
+    def __init__(self, window=PROFILER_WINDOW):
+        self.window = window
+        self.phases = {}  # phase name -> RingBuffer of nanoseconds, in first-seen order
+        self.counts = {}  # entity group name -> RingBuffer of counts
+        self.current = {}
+        self.frames = 0
+        self.frame_start = 0
+        self.last_lap = 0
+
+    def begin_frame(self):
+        self.frame_start = self.last_lap = time.perf_counter_ns()
+        self.current.clear()
+
+    def lap(self, name):
+        """Attribute the time since the previous lap (or frame start) to the named phase"""
+        now = time.perf_counter_ns()
+        self.current[name] = self.current.get(name, 0) + now - self.last_lap
+        self.last_lap = now
+
+    def end_frame(self, counts=None):
+        self.current['frame'] = time.perf_counter_ns() - self.frame_start
+        for name in self.current:
+            if name not in self.phases:
+                self.phases[name] = RingBuffer(self.window)
+        for name, ring in self.phases.items():
+            ring.push(self.current.get(name, 0))
+        if counts:
+            for name, value in counts.items():
+                ring = self.counts.get(name)
+                if ring is None:
+                    ring = self.counts[name] = RingBuffer(self.window)
+                ring.push(value)
+        self.frames += 1
+
+    def stats(self):
+        """Return {phase: {'p50', 'p95', 'p99', 'mean', 'max'}} in milliseconds"""
+        result = {}
+        for name, ring in self.phases.items():
+            values = ring.values()
+            p50, p95, p99 = ring.percentiles(50, 95, 99)
+            result[name] = {
+                'p50': p50 / 1e6,
+                'p95': p95 / 1e6,
+                'p99': p99 / 1e6,
+                'mean': sum(values) / len(values) / 1e6 if values else 0.0,
+                'max': max(values) / 1e6 if values else 0.0,
+            }
+        return result
+
+    def export(self, path):
+        """Write the rolling window to CSV (one row per frame) or JSON (stats plus samples)"""
+        if path.endswith('.csv'):
+            series = {**{f"{name}_ns": ring for name, ring in self.phases.items()}, **self.counts}
+            rows = max((ring.count for ring in series.values()), default=0)
+            # Series that started late are padded at the front so every row is one frame
+            columns = [[''] * (rows - ring.count) + ring.values() for ring in series.values()]
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['frame'] + list(series))
+                for row in range(rows):
+                    writer.writerow([self.frames - rows + row] + [column[row] for column in columns])
+        else:
+            data = {
+                'frames': self.frames,
+                'window': self.window,
+                'stats_ms': self.stats(),
+                'samples_ns': {name: ring.values() for name, ring in self.phases.items()},
+                'counts': {name: ring.values() for name, ring in self.counts.items()},
+            }
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2)
+
+class ProfilerOverlay:
+    """On-screen table of the profiler stats and live entity counts"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self.font = None
+        self.surface = None
+        self.refresh_timer = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.refresh_timer = 0
+
+    def draw(self, screen, dt, counts):
+        if not self.visible:
+            return
+        # Re-render the text only a few times per second so the overlay barely shows up in its own numbers
+        self.refresh_timer -= dt
+        if self.surface is None or self.refresh_timer <= 0:
+            self.refresh_timer = PROFILER_OVERLAY_REFRESH
+            self.surface = self._render(counts)
+        return screen.blit(self.surface, (10, screen.get_height() - self.surface.get_height() - 10))
+
+    def _render(self, counts):
+        if self.font is None:
+            self.font = pygame.font.SysFont("monospace", PROFILER_FONT_SIZE)
+
+        lines = [f"{'phase':<18}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for name, stat in self.profiler.stats().items():
+            lines.append(f"{name:<18}{stat['p50']:>8.2f}{stat['p95']:>8.2f}{stat['p99']:>8.2f}")
+        lines.append("")
+        for name, value in counts.items():
+            lines.append(f"{name:<18}{value:>8}")
+
+        rendered = [self.font.render(line, True, (255, 255, 255)) for line in lines]
+        line_height = self.font.get_linesize()
+        width = max(surface.get_width() for surface in rendered) + 12
+        surface = pygame.Surface((width, line_height * len(rendered) + 12), pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 160))
+        for i, text in enumerate(rendered):
+            surface.blit(text, (6, 6 + i * line_height))
+        return surface
\ No newline at end of file
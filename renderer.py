@@ -0,0 +1,77 @@
+import pygame
+from constants import DIRTY_RECT_RENDERING, DIRTY_RECT_MAX_COVERAGE, DIRTY_RECT_PADDING
+
+class Renderer:
+    """Presents frames either with a full background blit plus flip, or with dirty rectangles.
+
+    In dirty-rect mode only the areas drawn last frame are restored from the
+    background, and only the union of last frame's and this frame's rects is
+    pushed to the display. When those rects cover more than max_coverage of
+    the screen (a super attack, say) the frame falls back to a full flip.
+    Every draw call must report the rect it touched through add().
+    """
+
+    def __init__(self, screen, background, dirty_rects=DIRTY_RECT_RENDERING, max_coverage=DIRTY_RECT_MAX_COVERAGE):
+        self.screen = screen
+        self.background = background
+        self.dirty_rects = dirty_rects
+        self.max_coverage = max_coverage
+        self.screen_rect = screen.get_rect()
+        self.previous = []  # Rects drawn last frame, restored before drawing this one
+        self.current = []
+        self.full_redraw = True  # The first frame always draws everything
+
+        # Statistics
+        self.full_frames = 0
+        self.dirty_frames = 0
+
+    def toggle(self):
+        self.dirty_rects = not self.dirty_rects
+        self.full_redraw = True
+
+    def begin(self):
+        if not self.dirty_rects or self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous:
+                self.screen.blit(self.background, rect, rect)
+        self.current = []
+
+    def add(self, rect):
+        """Track a rect touched by a draw call (None is ignored)"""
+        if rect:
+            # pygame.draw can touch a pixel just outside the rect it reports near the screen edges
+            rect = rect.inflate(2 * DIRTY_RECT_PADDING, 2 * DIRTY_RECT_PADDING).clip(self.screen_rect)
+            if rect:
+                self.current.append(rect)
+
+    def present(self):
+        if not self.dirty_rects or self.full_redraw:
+            self._flip()
+        else:
+            dirty = merge_rects(self.previous + self.current)
+            area = sum(rect.width * rect.height for rect in dirty)
+            if area > self.max_coverage * self.screen_rect.width * self.screen_rect.height:
+                self._flip()
+            else:
+                pygame.display.update(dirty)
+                self.dirty_frames += 1
+        self.previous = self.current
+        self.full_redraw = False
+
+    def _flip(self):
+        pygame.display.flip()
+        self.full_frames += 1
+
+def merge_rects(rects):
+    """Union overlapping rects so the display is updated with fewer, non-overlapping regions"""
+    merged = []
+    for rect in sorted(rects, key=lambda r: (r.x, r.y)):
+        rect = rect.copy()
+        # Keep absorbing merged rects until this one no longer overlaps any of them
+        overlapping = rect.collidelist(merged)
+        while overlapping != -1:
+            rect.union_ip(merged.pop(overlapping))
+            overlapping = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
\ No newline at end of file
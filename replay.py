@@ -0,0 +1,75 @@
+import argparse
+import os
+import struct
+
+# File layout: a fixed header, then one fixed-size record per simulation step
+REPLAY_MAGIC = b"ASRP"
+REPLAY_VERSION = 5  # Bumped whenever the simulation changes, since old recordings would no longer play back the same
+HEADER = struct.Struct("<4sHqHH")  # magic, version, seed, width, height
+FRAME = struct.Struct("<dH")  # dt in seconds (float64, so replays are bit-exact), input mask
+
+class Recorder:
+    """Writes the per-step dt and input mask of a live session to a replay file"""
+
+    def __init__(self, path, seed, width, height):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, seed, width, height))
+        self.frames = 0
+
+    def record(self, dt, input_mask):
+        self.file.write(FRAME.pack(dt, input_mask))
+        self.frames += 1
+
+    def close(self):
+        self.file.close()
+
+class Replay:
+    """A loaded replay: the seed and resolution it was recorded with, plus its (dt, mask) frames"""
+
+    def __init__(self, seed, width, height, frames):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.frames = frames
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, width, height = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a replay file")
+        if version != REPLAY_VERSION:
+            raise ValueError(f"{path} has unsupported replay version {version}")
+        body = memoryview(data)[HEADER.size:]
+        usable = len(body) - len(body) % FRAME.size  # Ignore a torn last record
+        frames = list(FRAME.iter_unpack(body[:usable]))
+        return cls(seed, width, height, frames)
+
+    @property
+    def seconds(self):
+        return sum(dt for dt, _ in self.frames)
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded session headless at maximum speed")
+    parser.add_argument("path", help="replay file written by main.py --record")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+
+    # constants.py reads these at import time, so set them before importing the game
+    os.environ["ASTEROIDS_HEADLESS"] = "1"
+    os.environ["ASTEROIDS_RESOLUTION"] = f"{replay.width}x{replay.height}"
+    from main import Game
+
+    game = Game(headless=True, seed=replay.seed)
+    result = game.play_replay(replay)
+
+    print(f"Replayed {result['seconds']:.1f}s in {result['steps']} steps "
+          f"({result['wall_time']:.3f}s wall, {result['steps_per_second']:.0f} steps/s)")
+    print(f"Scores: {result['scores'][0]} - {result['scores'][1]}")
+    for name, count in result['counts'].items():
+        print(f"  {name}: {count}")
+
+if __name__ == "__main__":
+    main()
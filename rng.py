@@ -0,0 +1,21 @@
+import random
+
+# Separate random streams per subsystem, so extra draws in one subsystem
+# (say, more exhaust particles) never shift the numbers another one sees
+asteroid = random.Random()
+field = random.Random()
+exhaust = random.Random()
+explosion = random.Random()
+
+STREAMS = {
+    'asteroid': asteroid,
+    'field': field,
+    'exhaust': exhaust,
+    'explosion': explosion,
+}
+
+def seed(value):
+    """Seed every stream from a single integer seed"""
+    for name, stream in STREAMS.items():
+        # String seeds are hashed with SHA-512, so this is stable across runs and platforms
+        stream.seed(f"{value}:{name}")
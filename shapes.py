@@ -0,0 +1,125 @@
+import math
+import random
+import pygame
+from constants import (ASTEROID_SHAPE_VARIANTS, ASTEROID_SHAPE_SEED, ASTEROID_CRATER_COUNT, ASTEROID_MIN_POINTS,
+                       ASTEROID_MAX_POINTS, ASTEROID_MIN_VARIATION, ASTEROID_MAX_VARIATION)
+
+class AsteroidShape:
+    """One asteroid outline with its craters and surface bumps, shared by every asteroid that uses it.
+
+    Vertices and their normals are kept in local space at rotation 0, so
+    drawing at any rotation is one rotation per vertex, with no trig or
+    normalizing per vertex.
+    """
+
+    def __init__(self, key, radius, rand):
+        self.key = key  # Hashable and unique per shape, so identical asteroids share cached frames
+        self.radius = radius
+
+        # Lumpy outline: one vertex per equal angle step, at a random distance
+        self.num_points = rand.randint(ASTEROID_MIN_POINTS, ASTEROID_MAX_POINTS)
+        self.step = 360 / self.num_points  # Degrees between vertices
+        self.variations = tuple(rand.uniform(ASTEROID_MIN_VARIATION, ASTEROID_MAX_VARIATION)
+                                for _ in range(self.num_points))
+
+        # Random crater positions
+        craters = []
+        for _ in range(ASTEROID_CRATER_COUNT):
+            angle = rand.uniform(0, 360)
+            distance = rand.uniform(0.2, 0.8) * radius
+            crater_radius = rand.uniform(0.2, 0.4) * radius
+            craters.append((angle, distance, crater_radius))
+        self.craters = tuple(craters)
+
+        # Surface noise points, scaled with the asteroid size
+        noise_points = []
+        for _ in range(int(radius / 3)):
+            angle = rand.uniform(0, 360)
+            distance = rand.uniform(0.8, 1.0) * radius
+            size = rand.uniform(2, 4)
+            height = rand.uniform(0.5, 1.0)  # Relative height for lighting
+            noise_points.append((angle, distance, size, height))
+        self.noise_points = tuple(noise_points)
+
+        # Precomputed local-space geometry
+        vertices = []
+        normals = []
+        for i, variation in enumerate(self.variations):
+            angle = math.radians(self.step * i)
+            normal = (math.cos(angle), math.sin(angle))  # Vertices lie on rays from the centre
+            vertices.append((normal[0] * radius * variation, normal[1] * radius * variation))
+            normals.append(normal)
+        self.vertices = tuple(vertices)
+        self.normals = tuple(normals)
+        self.edges = tuple((x1 - x0, y1 - y0) for (x0, y0), (x1, y1) in zip(vertices, vertices[1:] + vertices[:1]))
+        self.edge_lengths_squared = tuple(ex * ex + ey * ey for ex, ey in self.edges)
+        self.outer_radius = radius * max(self.variations)
+
+    def points(self, rotation):
+        """Vertices and normals rotated by the given angle in degrees, as (x, y) tuples and Vector2s"""
+        angle = math.radians(rotation)
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        points = [(x * cos - y * sin, x * sin + y * cos) for x, y in self.vertices]
+        normals = [pygame.Vector2(x * cos - y * sin, x * sin + y * cos) for x, y in self.normals]
+        return points, normals
+
+    def outline(self, rotation, x=0.0, y=0.0):
+        """Vertices rotated by the given angle in degrees and moved to (x, y), without the normals of points()"""
+        angle = math.radians(rotation)
+        cos = math.cos(angle)
+        sin = math.sin(angle)
+        return [(x + vx * cos - vy * sin, y + vx * sin + vy * cos) for vx, vy in self.vertices]
+
+    def overlaps_circle(self, x, y, radius):
+        """Whether a circle centred at (x, y) in local space (rotation 0) touches the outline"""
+        if x * x + y * y > (self.outer_radius + radius) ** 2:
+            return False
+
+        # The outline is star-shaped around the centre: a point is inside
+        # when it is left of the one edge spanning its angle
+        sector = int((math.degrees(math.atan2(y, x)) % 360) / self.step) % self.num_points
+        x0, y0 = self.vertices[sector]
+        ex, ey = self.edges[sector]
+        if ex * (y - y0) - ey * (x - x0) >= 0:
+            return True
+
+        # Outside the outline, so the circle must reach one of its edges
+        radius_squared = radius * radius
+        for (x0, y0), (ex, ey), length_squared in zip(self.vertices, self.edges, self.edge_lengths_squared):
+            t = max(0.0, min(1.0, ((x - x0) * ex + (y - y0) * ey) / length_squared))
+            dx = x0 + ex * t - x
+            dy = y0 + ey * t - y
+            if dx * dx + dy * dy <= radius_squared:
+                return True
+        return False
+
+class ShapeLibrary:
+    """Pre-generated asteroid shapes, a fixed set of variants per radius.
+
+    Each radius gets its variants from its own seeded generator the first
+    time it is asked for, so the library is the same in every game and
+    does not depend on the order sizes come up in. Asteroids only pick a
+    variant, and all asteroids with the same variant share one shape.
+    """
+
+    def __init__(self, variants=ASTEROID_SHAPE_VARIANTS, seed=ASTEROID_SHAPE_SEED):
+        self.variants = variants
+        self.seed = seed
+        self.shapes = {}  # Radius -> tuple of AsteroidShape
+
+    def for_radius(self, radius):
+        shapes = self.shapes.get(radius)
+        if shapes is None:
+            rand = random.Random(f"{self.seed}:{radius:g}")  # Same stream whether radius is an int or a float
+            shapes = tuple(AsteroidShape((radius, index), radius, rand) for index in range(self.variants))
+            self.shapes[radius] = shapes
+        return shapes
+
+    def pick(self, radius, rand):
+        """A variant for the given radius, chosen with the given random stream"""
+        shapes = self.for_radius(radius)
+        return shapes[rand.randrange(len(shapes))]
+
+    def __len__(self):
+        return sum(len(shapes) for shapes in self.shapes.values())
@@ -1,27 +1,40 @@
 from circleshape import CircleShape 
 from constants import SHOT_RADIUS
-import pygame
+from pool import Pool, Pooled
+from stamps import circle_stamp
 
-class Shot(CircleShape):
-    containers = None  # This will be assigned dynamically in main.py
+class Shot(Pooled, CircleShape):
+    __slots__ = ('owner', 'stamp')
     game = None  # Will hold reference to game instance for sound access
     
     def __init__(self, x, y, velocity, owner=None):
         super().__init__(x, y, SHOT_RADIUS)
-        self.velocity = velocity
+        self.velocity.update(velocity)  # Copy, so pooled shots never share a vector
         self.owner = owner  # Store reference to the player who fired this shot
+        self.stamp = self.bake_stamp()
+
+    def reset(self, x, y, velocity, owner=None):
+        # Reinitialize a pooled shot in place
+        self.position.update(x, y)
+        self.prev_position.update(x, y)
+        self.velocity.update(velocity)
+        self.owner = owner
+        self.stamp = self.bake_stamp()
 
     def update(self, dt):
         # Move the shot according to its velocity
         self.position += self.velocity * dt
-        self.wrap_position()  # Wrap position after movement
 
-        # Remove the shot if it goes off-screen
-        screen_width, screen_height = pygame.display.get_surface().get_size()
-        if not (0 <= self.position.x <= screen_width and 0 <= self.position.y <= screen_height):
-            self.kill()  # Remove the shot from all sprite groups
+        # Shots don't wrap: remove the shot once it leaves the world
+        if not self.world.contains(self.position):
+            self.kill()  # Remove the shot from the registry
+
+    def bake_stamp(self):
+        # The shot in the owner's color if available, otherwise white; stamps are shared per color
+        return circle_stamp(self.owner.color if self.owner else (255, 255, 255), self.radius)
 
     def draw(self, screen):
-        # Draw the shot in the owner's color if available, otherwise white
-        color = self.owner.color if self.owner else (255, 255, 255)
-        pygame.draw.circle(screen, color, (int(self.position.x), int(self.position.y)), self.radius)
+        position = self.screen_position()
+        return screen.blit(self.stamp, (int(position.x) - self.radius, int(position.y) - self.radius))
+
+Shot.pool = Pool(Shot)
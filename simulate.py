@@ -0,0 +1,37 @@
+import argparse
+import os
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless Asteroids simulation as fast as possible")
+    parser.add_argument("--seconds", type=float, default=60, help="simulated seconds to run")
+    parser.add_argument("--hz", type=float, default=60, help="fixed simulation rate in steps per second")
+    parser.add_argument("--resolution", default="1920x1080", help="playfield size as WIDTHxHEIGHT")
+    parser.add_argument("--continuous", action="store_true",
+                        help="sweep shots over each step so coarse timesteps (--hz 30 or lower) don't miss hits")
+    args = parser.parse_args()
+
+    # constants.py reads these at import time, so set them before importing the game
+    os.environ["ASTEROIDS_HEADLESS"] = "1"
+    os.environ["ASTEROIDS_RESOLUTION"] = args.resolution
+    import constants
+    constants.COLLISION_CONTINUOUS = args.continuous or constants.COLLISION_CONTINUOUS
+    from main import Game
+
+    game = Game(headless=True)
+    result = game.simulate(args.seconds, 1 / args.hz)
+
+    print(f"Simulated {result['seconds']:.1f}s in {result['steps']} steps "
+          f"({result['wall_time']:.3f}s wall, {result['steps_per_second']:.0f} steps/s)")
+    print(f"Scores: {result['scores'][0]} - {result['scores'][1]}")
+    for name, count in result['counts'].items():
+        print(f"  {name}: {count}")
+    field = result['field']
+    print(f"Asteroid field: mass {field['mass']}, {field['spawned']} spawned ({field['throttled']} throttled), "
+          f"{field['deferred_mass']} deferred at the mass cap, {field['deferred_frame']} over the frame budget")
+    print("Pools:")
+    for name, stats in result['pools'].items():
+        print(f"  {name}: {stats['in_use']} in use, {stats['size']} free, high water {stats['high_water']}, "
+              f"{stats['created']} created, {stats['reused']} reused")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""Capture the whole simulation as compact binary, and restore it into a running game.
+
+Example:
+    python3 snapshot.py save midgame.snap --seconds 120 --bot
+    python3 snapshot.py fork midgame.snap --forks 16 --seconds 30 --bot
+
+A snapshot holds everything a step reads: both players (with their
+exhaust particles), every asteroid, shot and explosion, the asteroid
+field's timer and counters, and the state of every random stream. So a
+restored game steps on exactly as the captured one would have. Drawing
+state (sprite frames, the camera, LOD) is rebuilt as the game runs.
+
+Asteroid outlines are not stored, only which variant of the shape library
+each asteroid uses, so restoring needs a library with the same seed and
+number of variants. Forks each restore the same heavy state and reseed
+their random streams, so they play out differently from there without
+replaying the minutes it took to get there.
+"""
+import argparse
+import os
+import struct
+import time
+import numpy as np
+from headless import Bot, run_in_processes
+
+# File layout: a fixed header, the random streams, the field, two players, then each section of entities
+SNAPSHOT_MAGIC = b"ASSN"
+SNAPSHOT_VERSION = 1  # Bumped whenever the layout changes
+HEADER = struct.Struct("<4sHqIIqHIII")  # magic, version, seed, world width, height, shape seed, shape variants,
+                                        # asteroid, shot and explosion counts
+RNG_STATE = struct.Struct("<B625I?d")  # Mersenne Twister version, key and position, whether a gauss is cached, the gauss
+FIELD = struct.Struct("<dd4q")  # spawn timer, frame ms, spawned, throttled, deferred at the mass cap, over budget
+PLAYER = struct.Struct("<13dqi??b")  # position, prev position, velocity, rotation, shoot, super and stun timers,
+                                     # knockback velocity, exhaust spawn timer, score, control mask (-1 for none),
+                                     # stunned, moving, move direction; then its exhaust particles
+SHOT = struct.Struct("<6db")  # position, prev position, velocity, owner (player index, -1 for none)
+PARTICLE_COUNT = struct.Struct("<I")
+
+# Per-asteroid columns, in the order they are written; radius first so restore can spawn from it
+ASTEROID_COLUMNS = ('radius', 'position', 'prev_position', 'velocity', 'rotation', 'rotation_speed')
+PARTICLE_COLUMNS = ('position', 'velocity', 'lifetime', 'max_lifetime', 'initial_size', 'size',
+                    'color', 'alpha', 'shrink', 'quick_fade')
+
+def _column_bytes(array):
+    return np.ascontiguousarray(array, dtype=array.dtype.newbyteorder('<')).tobytes()
+
+def _read_column(data, offset, like, count):
+    """Read count rows shaped like the given array; returns (rows, offset after them)"""
+    dtype = like.dtype.newbyteorder('<')
+    shape = (count,) + like.shape[1:]
+    rows = np.frombuffer(data, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+    return rows, offset + rows.nbytes
+
+def _particle_bytes(particles):
+    n = particles.count
+    parts = [PARTICLE_COUNT.pack(n)]
+    parts.extend(_column_bytes(getattr(particles, name)[:n]) for name in PARTICLE_COLUMNS)
+    return parts
+
+def _read_particles(particles, data, offset):
+    (n,) = PARTICLE_COUNT.unpack_from(data, offset)
+    offset += PARTICLE_COUNT.size
+    particles.clear()
+    particles.reserve(n)
+    for name in PARTICLE_COLUMNS:
+        array = getattr(particles, name)
+        array[:n], offset = _read_column(data, offset, array, n)
+    particles.count = n
+    return offset
+
+def read_header(data):
+    """The header fields of a snapshot as a dict, after checking its magic and version"""
+    magic, version, seed, width, height, shape_seed, shape_variants, asteroids, shots, explosions = \
+        HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+    return {
+        'seed': seed,
+        'width': width,
+        'height': height,
+        'shape_seed': shape_seed,
+        'shape_variants': shape_variants,
+        'asteroids': asteroids,
+        'shots': shots,
+        'explosions': explosions,
+    }
+
+def capture(game):
+    """Serialize the game's simulation state to bytes"""
+    import rng
+    from asteroid import Asteroid
+
+    players = (game.player1, game.player2)
+    asteroids = game.asteroids.sprites()
+    shots = game.shots.sprites()
+    explosions = game.explosions.sprites()
+    parts = [HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, game.seed, game.world.width, game.world.height,
+                         Asteroid.shapes.seed, Asteroid.shapes.variants,
+                         len(asteroids), len(shots), len(explosions))]
+
+    for stream in rng.STREAMS.values():
+        version, internal, gauss = stream.getstate()
+        parts.append(RNG_STATE.pack(version, *internal, gauss is not None, gauss or 0.0))
+
+    field = game.asteroid_field
+    parts.append(FIELD.pack(field.spawn_timer, field.frame_ms, field.spawned, field.throttled,
+                            field.deferred_mass, field.deferred_frame))
+
+    for player in players:
+        parts.append(PLAYER.pack(*player.position, *player.prev_position, *player.velocity,
+                                 player.rotation, player.shoot_timer, player.super_timer, player.stun_timer,
+                                 *player.knockback_velocity, player.exhaust.spawn_timer, player.score,
+                                 -1 if player.control_mask is None else player.control_mask,
+                                 player.is_stunned, player.is_moving, player.move_direction))
+        parts.extend(_particle_bytes(player.exhaust.particles))
+
+    # Asteroids as whole store columns, in group order (the order collisions resolve in)
+    store = game.asteroid_store
+    slots = [asteroid.slot for asteroid in asteroids]
+    parts.extend(_column_bytes(getattr(store, name)[slots]) for name in ASTEROID_COLUMNS)
+    parts.append(_column_bytes(np.array([asteroid.shape.key[1] for asteroid in asteroids], dtype=np.uint16)))
+
+    for shot in shots:
+        owner = players.index(shot.owner) if shot.owner in players else -1
+        parts.append(SHOT.pack(*shot.position, *shot.prev_position, *shot.velocity, owner))
+
+    for explosion in explosions:
+        parts.extend(_particle_bytes(explosion.particles))
+    return b"".join(parts)
+
+def restore(game, data):
+    """Replace the game's simulation state with a captured one.
+
+    The game must have the same world size as the one captured. Its
+    current asteroids, shots and explosions go back to their pools and
+    the restored ones are taken from there.
+    """
+    import pygame
+    import rng
+    from asteroid import Asteroid
+    from shot import Shot
+    from explosion import Explosion
+
+    header = read_header(data)
+    if (header['width'], header['height']) != game.world.size:
+        raise ValueError(f"snapshot world is {header['width']}x{header['height']}, "
+                         f"this game's is {game.world.width}x{game.world.height}")
+    if (header['shape_seed'], header['shape_variants']) != (Asteroid.shapes.seed, Asteroid.shapes.variants):
+        raise ValueError("snapshot was taken with a different asteroid shape library")
+    data = memoryview(data)
+    offset = HEADER.size
+
+    # Empty the world, so everything restored comes back in its captured order
+    for entity in (*game.asteroids, *game.shots, *game.explosions):
+        entity.kill()
+    Shot.pool.collect()
+    Asteroid.pool.collect()
+    Explosion.pool.collect()
+
+    rng_states = []
+    for _ in rng.STREAMS:
+        version, *internal, has_gauss, gauss = RNG_STATE.unpack_from(data, offset)
+        rng_states.append((version, tuple(internal), gauss if has_gauss else None))
+        offset += RNG_STATE.size
+
+    field = game.asteroid_field
+    (field.spawn_timer, field.frame_ms, field.spawned, field.throttled,
+     field.deferred_mass, field.deferred_frame) = FIELD.unpack_from(data, offset)
+    offset += FIELD.size
+
+    players = (game.player1, game.player2)
+    for player in players:
+        values = PLAYER.unpack_from(data, offset)
+        offset += PLAYER.size
+        player.position.update(values[0], values[1])
+        player.prev_position.update(values[2], values[3])
+        player.velocity = pygame.Vector2(values[4], values[5])
+        player.rotation, player.shoot_timer, player.super_timer, player.stun_timer = values[6:10]
+        player.knockback_velocity = pygame.Vector2(values[10], values[11])
+        player.exhaust.spawn_timer = values[12]
+        player.score = values[13]
+        player.control_mask = None if values[14] < 0 else values[14]
+        player.is_stunned, player.is_moving, player.move_direction = values[15:18]
+        offset = _read_particles(player.exhaust.particles, data, offset)
+
+    # Spawn the asteroids, then overwrite the kinematics and shapes they were spawned with
+    count = header['asteroids']
+    store = game.asteroid_store
+    columns = {}
+    for name in ASTEROID_COLUMNS:
+        columns[name], offset = _read_column(data, offset, getattr(store, name), count)
+    variants, offset = _read_column(data, offset, np.zeros(0, dtype=np.uint16), count)
+    use_sprite_cache = Asteroid.use_sprite_cache
+    Asteroid.use_sprite_cache = False  # Don't bake frames for the throwaway spawn shapes
+    asteroids = []
+    for radius, (x, y), variant in zip(columns['radius'].tolist(), columns['position'].tolist(), variants.tolist()):
+        asteroid = game.entities.add(Asteroid.spawn(x, y, radius, store))
+        asteroid.shape = Asteroid.shapes.for_radius(radius)[variant]
+        asteroids.append(asteroid)
+    Asteroid.use_sprite_cache = use_sprite_cache
+    slots = [asteroid.slot for asteroid in asteroids]
+    for name, rows in columns.items():
+        getattr(store, name)[slots] = rows
+
+    for _ in range(header['shots']):
+        values = SHOT.unpack_from(data, offset)
+        offset += SHOT.size
+        owner = players[values[6]] if values[6] >= 0 else None
+        shot = game.entities.add(Shot.spawn(values[0], values[1], pygame.Vector2(values[4], values[5]), owner=owner))
+        shot.prev_position.update(values[2], values[3])
+
+    for _ in range(header['explosions']):
+        explosion = game.entities.add(Explosion.spawn(0, 0))
+        offset = _read_particles(explosion.particles, data, offset)
+
+    # Last, since spawning above drew from the streams
+    for stream, state in zip(rng.STREAMS.values(), rng_states):
+        stream.setstate(state)
+    game.seed = header['seed']
+
+_fork_game = None
+
+def _start_fork_worker(data):
+    """Build one headless game per worker process; every fork it runs restores into it"""
+    global _fork_game
+    header = read_header(data)
+    os.environ["ASTEROIDS_HEADLESS"] = "1"
+    os.environ["ASTEROIDS_RESOLUTION"] = f"{header['width']}x{header['height']}"
+    from main import Game
+    _fork_game = Game(headless=True, seed=header['seed'])
+
+def run_fork(case):
+    """Restore the snapshot, reseed the random streams for this fork and simulate; returns its measurements"""
+    data, fork, seconds, hz, bot = case
+    import rng
+
+    game = _fork_game
+    start = time.perf_counter()
+    restore(game, data)
+    restore_time = time.perf_counter() - start
+    rng.seed(f"{game.seed}:fork{fork}")
+    driver = Bot(f"{game.seed}:fork{fork}") if bot else None
+
+    steps = int(round(seconds * hz))
+    start = time.perf_counter()
+    for _ in range(steps):
+        game.step(1 / hz, driver.mask() if driver else 0)
+    return {
+        'fork': fork,
+        'restore_time': restore_time,
+        'wall_time': time.perf_counter() - start,
+        'scores': (game.player1.score, game.player2.score),
+        'counts': game.entity_counts(),
+    }
+
+def save(args):
+    os.environ["ASTEROIDS_HEADLESS"] = "1"
+    os.environ["ASTEROIDS_RESOLUTION"] = args.resolution
+    from main import Game
+
+    game = Game(headless=True, seed=args.seed)
+    driver = Bot(game.seed) if args.bot else None
+    for _ in range(int(round(args.seconds * args.hz))):
+        game.step(1 / args.hz, driver.mask() if driver else 0)
+
+    start = time.perf_counter()
+    data = capture(game)
+    elapsed = time.perf_counter() - start
+    with open(args.path, "wb") as f:
+        f.write(data)
+    counts = ", ".join(f"{count} {name}" for name, count in game.entity_counts().items())
+    print(f"Saved {args.seconds:.1f}s of play (seed {game.seed}: {counts}) to {args.path}: "
+          f"{len(data)} bytes, captured in {elapsed * 1000:.2f} ms")
+
+def fork(args):
+    with open(args.path, "rb") as f:
+        data = f.read()
+    read_header(data)  # Fail here rather than in every worker
+
+    cases = [(data, index, args.seconds, args.hz, args.bot) for index in range(args.forks)]
+    results = run_in_processes(run_fork, cases, args.workers, initializer=_start_fork_worker, initargs=(data,))
+
+    for result in results:
+        counts = ", ".join(f"{count} {name}" for name, count in result['counts'].items())
+        print(f"  fork {result['fork']}: scores {result['scores'][0]} - {result['scores'][1]}, {counts} "
+              f"({result['restore_time'] * 1000:.2f} ms restore, {result['wall_time']:.3f}s wall)")
+    print(f"Forked {len(results)} simulations of {args.seconds:.1f}s from {args.path}, mean restore "
+          f"{sum(result['restore_time'] for result in results) / len(results) * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Checkpoint a headless game and fork simulations from it")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = commands.add_parser("save", help="simulate from the start and save the state at the end")
+    save_parser.add_argument("path", help="snapshot file to write")
+    save_parser.add_argument("--seconds", type=float, default=120, help="simulated seconds before the snapshot")
+    save_parser.add_argument("--seed", type=int, help="seed for all gameplay randomness")
+    save_parser.add_argument("--resolution", default="1920x1080", help="playfield size as WIDTHxHEIGHT")
+    save_parser.set_defaults(handler=save)
+
+    fork_parser = commands.add_parser("fork", help="run simulations that all start from a snapshot")
+    fork_parser.add_argument("path", help="snapshot file written by the save command")
+    fork_parser.add_argument("--forks", type=int, default=8, help="simulations to run")
+    fork_parser.add_argument("--seconds", type=float, default=30, help="simulated seconds per fork")
+    fork_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    fork_parser.set_defaults(handler=fork)
+
+    for command in (save_parser, fork_parser):
+        command.add_argument("--hz", type=float, default=60, help="fixed simulation rate in steps per second")
+        command.add_argument("--bot", action="store_true", help="drive both players with a seeded bot instead of idling")
+
+    args = parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
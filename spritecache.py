@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from constants import ASTEROID_ROTATION_BUCKETS, ASTEROID_SPRITE_CACHE_MB
+
+class SpriteCache:
+    """Bounded LRU cache of pre-rendered, pre-rotated sprite frames.
+
+    Frames are keyed by a hashable shape key plus a quantized rotation bucket,
+    so every object with an identical shape shares the same frames.
+    """
+
+    def __init__(self, buckets=ASTEROID_ROTATION_BUCKETS, max_bytes=ASTEROID_SPRITE_CACHE_MB * 1024 * 1024):
+        self.buckets = buckets
+        self.bucket_size = 360 / buckets  # Degrees covered by one bucket
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()  # (shape_key, bucket) -> Surface, oldest first
+        self.bytes_used = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bucket(self, rotation):
+        # Snap a rotation in degrees to the nearest bucket index
+        return int(round((rotation % 360) / self.bucket_size)) % self.buckets
+
+    def angle(self, rotation):
+        """The rotation a cached frame for this rotation is drawn at"""
+        return self.bucket(rotation) * self.bucket_size
+
+    def get(self, shape_key, rotation, render):
+        """Return the frame for shape_key at rotation, rendering it with render(angle) on a miss"""
+        frame_key = (shape_key, self.bucket(rotation))
+        surface = self.frames.get(frame_key)
+        if surface is not None:
+            self.frames.move_to_end(frame_key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = render(frame_key[1] * self.bucket_size)
+        self.frames[frame_key] = surface
+        self.bytes_used += self._frame_bytes(surface)
+
+        # Evict least recently used frames until we are back under budget
+        while self.bytes_used > self.max_bytes and len(self.frames) > 1:
+            _, evicted = self.frames.popitem(last=False)
+            self.bytes_used -= self._frame_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            'frames': len(self.frames),
+            'bytes': self.bytes_used,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    @staticmethod
+    def _frame_bytes(surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import pygame
+
+_stamps = {}
+
+def get_stamp(r, g, b, a, diameter, radius):
+    """Return a cached SRCALPHA circle stamp"""
+    key = (r, g, b, a, diameter, radius)
+    stamp = _stamps.get(key)
+    if stamp is None:
+        stamp = pygame.Surface((diameter, diameter), pygame.SRCALPHA)
+        pygame.draw.circle(stamp, (r, g, b, a), (diameter // 2, diameter // 2), radius)
+        _stamps[key] = stamp
+    return stamp
+
+_circle_stamps = {}
+
+def circle_stamp(color, radius):
+    """Opaque stamp that blits the same pixels as pygame.draw.circle(color, radius) at its top-left corner.
+
+    Colorkeyed and RLE-encoded rather than per-pixel alpha, which blits
+    about twice as fast as drawing the circle.
+    """
+    color = tuple(pygame.Color(color))[:3]
+    key = (color, radius)
+    stamp = _circle_stamps.get(key)
+    if stamp is None:
+        transparent = (0, 0, 0) if color != (0, 0, 0) else (255, 255, 255)
+        stamp = pygame.Surface((radius * 2, radius * 2))
+        stamp.fill(transparent)
+        pygame.draw.circle(stamp, color, (radius, radius), radius)
+        stamp.set_colorkey(transparent, pygame.RLEACCEL)
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert()
+        _circle_stamps[key] = stamp
+    return stamp
+
+class StampBatch:
+    """Collects small prebaked sprites for one Surface.blits call per frame.
+
+    Positions are in screen coordinates; submitters that work in world
+    coordinates subtract offset (the camera's) first. Stamps entirely
+    outside the viewport are dropped as they are added.
+    flush() blits everything collected, in the order it was added, and
+    returns the rects to report for dirty-rect rendering: one per stamp
+    from add(), or the one bounding rect given to add_many().
+    """
+
+    def __init__(self, viewport):
+        self.viewport = pygame.Rect(viewport)
+        self.offset = (0, 0)  # World to screen translation, set each frame by the game
+        self.blits = []  # (surface, (x, y)) pairs for Surface.blits
+        self.singles = []  # Indices into blits whose own rect is reported
+        self.bounds = []  # Rects reported for add_many() groups
+
+        # Statistics
+        self.batches = 0
+        self.submitted = 0
+        self.culled = 0
+
+    def add(self, stamp, x, y):
+        width, height = stamp.get_size()
+        viewport = self.viewport
+        if x + width <= viewport.left or x >= viewport.right or y + height <= viewport.top or y >= viewport.bottom:
+            self.culled += 1
+            return
+        self.singles.append(len(self.blits))
+        self.blits.append((stamp, (x, y)))
+
+    def add_circles(self, shapes):
+        """Add circle shapes by their prebaked .stamp at their screen positions, in one call for all of them"""
+        viewport = self.viewport
+        left, top, right, bottom = viewport.left, viewport.top, viewport.right, viewport.bottom
+        blits = self.blits
+        start = len(blits)
+        for shape in shapes:
+            position = shape.screen_position()
+            radius = shape.radius
+            x = int(position.x) - radius
+            y = int(position.y) - radius
+            if x + 2 * radius <= left or x >= right or y + 2 * radius <= top or y >= bottom:
+                self.culled += 1
+                continue
+            blits.append((shape.stamp, (x, y)))
+        self.singles.extend(range(start, len(blits)))
+
+    def add_many(self, blits, bounds, culled=0):
+        """Add (surface, (x, y)) pairs already culled by the caller, with one rect bounding them all"""
+        if blits:
+            self.blits.extend(blits)
+            self.bounds.append(bounds)
+        self.culled += culled
+
+    def flush(self, screen):
+        rects = self.bounds
+        if self.blits:
+            drawn = screen.blits(self.blits)
+            rects.extend(drawn[i] for i in self.singles)
+            self.batches += 1
+            self.submitted += len(self.blits)
+        self.blits = []
+        self.singles = []
+        self.bounds = []
+        return rects
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'submitted': self.submitted,
+            'culled': self.culled,
+        }
@@ -0,0 +1,131 @@
+"""Run headless simulations over a grid of constant overrides and seeds in parallel.
+
+Example:
+    python3 sweep.py --set ASTEROID_SPAWN_RATE=0.5,1,2 --set SUPER_ATTACK_BULLETS=24,48 --seeds 3 --bot
+
+Overrides are applied to constants.py before the game is imported, in a
+fresh process per run. Constants derived from an overridden one (such as
+ASTEROID_MAX_RADIUS from ASTEROID_MIN_RADIUS) are not recomputed, so
+override them too when they matter.
+"""
+import argparse
+import ast
+import itertools
+import os
+from headless import Bot, run_in_processes
+
+def parse_override(text):
+    """Parse NAME=V1,V2,... into (name, [values]); values are Python literals"""
+    name, _, values = text.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE[,VALUE...], got {text!r}")
+    return name, [ast.literal_eval(value) for value in values.split(",")]
+
+def run_case(case):
+    """Simulate one (overrides, seed) case in this process and return its measurements"""
+    overrides, seed, seconds, hz, resolution, bot = case
+    os.environ["ASTEROIDS_HEADLESS"] = "1"
+    os.environ["ASTEROIDS_RESOLUTION"] = resolution
+
+    # Game modules copy constants with star imports, so patch the module before any of them load
+    import constants
+    for name, value in overrides:
+        if not hasattr(constants, name):
+            raise ValueError(f"constants.py has no {name}")
+        setattr(constants, name, value)
+    from main import Game
+    from profiler import FrameProfiler
+
+    steps = int(round(seconds * hz))
+    game = Game(headless=True, seed=seed)
+    game.profiler = FrameProfiler(window=steps)
+    driver = Bot(seed) if bot else None
+    high_water = {}
+    for _ in range(steps):
+        game.profiler.begin_frame()
+        game.step(1 / hz, driver.mask() if driver else 0)
+        counts = game.entity_counts()
+        game.profiler.end_frame(counts)
+        for name, count in counts.items():
+            high_water[name] = max(high_water.get(name, 0), count)
+
+    stats = game.profiler.stats()
+    return {
+        'overrides': overrides,
+        'seed': seed,
+        'high_water': high_water,
+        'step_ms': stats['frame'],
+        'update_ms': stats['update'],
+        'scores': (game.player1.score, game.player2.score),
+        'pools': game.pool_stats(),
+    }
+
+def aggregate(results, budget_ms):
+    """Fold the per-seed results of each override set into one table row"""
+    rows = {}
+    for result in results:
+        row = rows.setdefault(result['overrides'], {'runs': [], 'high_water': {}})
+        row['runs'].append(result)
+        for name, count in result['high_water'].items():
+            row['high_water'][name] = max(row['high_water'].get(name, 0), count)
+
+    table = []
+    for overrides, row in rows.items():
+        runs = row['runs']
+        step_p95 = max(run['step_ms']['p95'] for run in runs)
+        table.append({
+            'overrides': overrides,
+            'seeds': len(runs),
+            'high_water': row['high_water'],
+            'update_p50': sum(run['update_ms']['p50'] for run in runs) / len(runs),
+            'update_p95': max(run['update_ms']['p95'] for run in runs),
+            'step_p95': step_p95,
+            'step_max': max(run['step_ms']['max'] for run in runs),
+            'score': sum(sum(run['scores']) for run in runs) / len(runs),
+            'over_budget': step_p95 > budget_ms,
+        })
+    return table
+
+def print_table(table, budget_ms):
+    count_names = sorted({name for row in table for name in row['high_water']})
+    header = (["overrides", "seeds"] + [f"max {name}" for name in count_names] +
+              ["update p50", "update p95", "step p95", "step max", "score"])
+    lines = []
+    for row in table:
+        label = " ".join(f"{name}={value!r}" for name, value in row['overrides']) or "(defaults)"
+        if row['over_budget']:
+            label = "! " + label
+        lines.append([label, str(row['seeds'])] + [str(row['high_water'].get(name, 0)) for name in count_names] +
+                     [f"{row['update_p50']:.3f}", f"{row['update_p95']:.3f}", f"{row['step_p95']:.3f}",
+                      f"{row['step_max']:.3f}", f"{row['score']:.0f}"])
+    widths = [max(len(header[i]), *(len(line[i]) for line in lines)) for i in range(len(header))]
+    print("  ".join(title.ljust(widths[0]) if i == 0 else title.rjust(widths[i]) for i, title in enumerate(header)))
+    for line in lines:
+        print("  ".join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i]) for i, cell in enumerate(line)))
+    print(f"Times in ms per simulation step; ! marks settings whose step p95 exceeds the {budget_ms:.2f} ms budget")
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep constant overrides across headless simulations")
+    parser.add_argument("--set", dest="overrides", action="append", type=parse_override, default=[],
+                        metavar="NAME=V1,V2", help="constant to override, with the values to try (repeatable)")
+    parser.add_argument("--seeds", type=int, default=3, help="seeds per override set")
+    parser.add_argument("--seconds", type=float, default=60, help="simulated seconds per run")
+    parser.add_argument("--hz", type=float, default=60, help="fixed simulation rate in steps per second")
+    parser.add_argument("--resolution", default="1920x1080", help="playfield size as WIDTHxHEIGHT")
+    parser.add_argument("--bot", action="store_true", help="drive both players with a seeded bot instead of idling")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--budget-ms", type=float, default=1000 / 60, help="frame budget to flag settings against")
+    args = parser.parse_args()
+
+    names = [name for name, _ in args.overrides]
+    combinations = [tuple(zip(names, values)) for values in itertools.product(*(values for _, values in args.overrides))]
+    cases = [(overrides, seed, args.seconds, args.hz, args.resolution, args.bot)
+             for overrides in combinations for seed in range(args.seeds)]
+
+    # Single-use workers: every run imports the game fresh with its own overrides
+    results = run_in_processes(run_case, cases, args.workers, maxtasksperchild=1)
+
+    print_table(aggregate(results, args.budget_ms), args.budget_ms)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import numpy as np
+import pygame
+
+class WorldBounds:
+    """The playfield: its size, and the one set of wrap and despawn rules every entity follows.
+
+    Ships and asteroids wrap as soon as their centre crosses an edge,
+    reappearing on the opposite edge. Shots despawn instead, once their
+    centre leaves the world.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.size = (width, height)
+
+    @property
+    def rect(self):
+        return pygame.Rect(0, 0, self.width, self.height)
+
+    def wrap(self, position):
+        """Wrap a Vector2 position in place"""
+        position.x, position.y = self.wrap_point(position.x, position.y)
+
+    def wrap_point(self, x, y):
+        """The wrapped (x, y) of a point"""
+        if x < 0:
+            x = self.width
+        elif x > self.width:
+            x = 0
+        if y < 0:
+            y = self.height
+        elif y > self.height:
+            y = 0
+        return x, y
+
+    def wrap_array(self, positions):
+        """Wrap an (n, 2) array of positions in place, with the same rule as wrap()"""
+        low = positions < 0
+        high = positions > self.size
+        if low.any() or high.any():
+            np.copyto(positions, self.size, where=low)
+            np.copyto(positions, 0, where=high)
+
+    def contains(self, position):
+        return 0 <= position.x <= self.width and 0 <= position.y <= self.height
+
+class Camera:
+    """The part of the world shown on screen, a screen-sized viewport with its top-left corner at (x, y).
+
+    While the world is no bigger than the screen the camera stays at the
+    origin, so world and screen coordinates are the same. In a larger
+    world follow() centres it on the given points, clamped so it never
+    looks past the world's edges.
+    """
+
+    def __init__(self, world, width, height):
+        self.world = world
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+
+    @property
+    def offset(self):
+        """Subtract from a world position to get its screen position"""
+        return (self.x, self.y)
+
+    def follow(self, points):
+        if self.world.width <= self.width and self.world.height <= self.height:
+            return
+        center_x = sum(point.x for point in points) / len(points)
+        center_y = sum(point.y for point in points) / len(points)
+        # Whole pixels, so the scene doesn't shimmer as the camera moves
+        self.x = int(max(0, min(self.world.width - self.width, center_x - self.width / 2)))
+        self.y = int(max(0, min(self.world.height - self.height, center_y - self.height / 2)))
+
+    def shows(self, x, y, reach):
+        """Whether anything within reach of screen position (x, y) is on screen"""
+        return -reach < x < self.width + reach and -reach < y < self.height + reach